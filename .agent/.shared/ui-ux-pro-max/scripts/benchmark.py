@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - latency, throughput and ranking checks for the search engine
+Usage: python benchmark.py [--scales 1,10,100] [--repeat 5] [--output bench.json]
+       python benchmark.py --compare before.json [--output after.json]
+
+Each scale copies data/ into a temp dir with every CSV's rows repeated N times and measures:
+  cold_build     search.py process with no compiled index (build + query)
+  cold_start     search.py process with a compiled index on disk
+  batch          search.py --batch over the whole query corpus (queries/sec)
+  warm_index     in-process search against a loaded index, result cache disabled
+  cached         in-process search with the result cache enabled
+  design_system  generate_design_system() latency, result cache disabled
+
+Rankings are checked against a frozen copy of the original BM25 implementation (and the
+sparse backend when NumPy/SciPy are installed); any mismatch makes the run exit non-zero.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from math import ceil, log
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPTS_DIR = Path(__file__).parent
+SOURCE_DATA_DIR = SCRIPTS_DIR.parent / "data"
+
+# ============ QUERY CORPUS ============
+DOMAIN_QUERIES = {
+    "style": ["glassmorphism dark", "minimalism clean professional", "brutalism bold", "playful colorful kids"],
+    "prompt": ["glassmorphism", "neumorphism soft shadow", "retro futurism", "flat design"],
+    "color": ["saas", "healthcare calm", "fintech trust", "beauty spa"],
+    "chart": ["trend over time", "comparison categories", "funnel conversion", "real-time dashboard"],
+    "landing": ["hero social-proof", "pricing testimonial", "hero-centric video", "waitlist launch"],
+    "product": ["fintech dashboard", "e-commerce luxury", "beauty spa wellness service", "education platform"],
+    "ux": ["animation accessibility", "z-index stacking", "loading skeleton", "form validation errors"],
+    "typography": ["elegant luxury serif", "playful rounded", "professional corporate", "modern tech mono"],
+    "icons": ["navigation arrow", "social media", "settings gear", "user profile"],
+    "react": ["waterfall suspense", "bundle size", "memo rerender", "cache fetch"],
+    "web": ["aria focus keyboard", "semantic html", "virtualize long list", "reduced motion"],
+}
+
+STACK_QUERIES = ["layout responsive form", "state management performance", "image accessibility"]
+
+DESIGN_SYSTEM_BRIEFS = [
+    "beauty spa wellness service elegant",
+    "fintech crypto dashboard",
+    "saas analytics dark",
+    "e-commerce luxury fashion",
+    "education kids playful",
+]
+
+
+def query_corpus():
+    """Fixed list of search payloads covering every domain and stack"""
+    from core import STACK_CONFIG
+    payloads = [{"query": q, "domain": domain} for domain, queries in DOMAIN_QUERIES.items() for q in queries]
+    payloads += [{"query": q, "stack": stack} for stack in STACK_CONFIG for q in STACK_QUERIES]
+    return payloads
+
+
+# ============ MEASUREMENT HELPERS ============
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[max(0, ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def latency_stats(samples):
+    """p50/p99/mean in milliseconds for a list of durations in seconds"""
+    if not samples:
+        return {"n": 0}
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3)
+    }
+
+
+def _rss_mb(maxrss):
+    """ru_maxrss is KiB on Linux and bytes on macOS"""
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process"""
+    return _rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) if resource else None
+
+
+def run_process(args, env, stdin_text=None):
+    """Run a child Python process; returns (seconds, stdout, peak RSS in MB or None)"""
+    with tempfile.TemporaryFile() as stdin, tempfile.TemporaryFile() as stdout:
+        if stdin_text is not None:
+            stdin.write(stdin_text.encode("utf-8"))
+            stdin.seek(0)
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable] + args, stdin=stdin, stdout=stdout,
+                                stderr=subprocess.DEVNULL, env=env)
+        rss = None
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+            rss = _rss_mb(usage.ru_maxrss)
+        else:
+            proc.wait()
+        elapsed = time.perf_counter() - start
+        stdout.seek(0)
+        output = stdout.read().decode("utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}")
+    return elapsed, output, rss
+
+
+# ============ SYNTHETIC DATA ============
+def make_scaled_data(target, scale):
+    """Copy data/ to target with every CSV's data rows repeated scale times"""
+    rows = 0
+    for src in sorted(SOURCE_DATA_DIR.rglob("*.csv")):
+        if ".index" in src.parts:
+            continue
+        dest = target / src.relative_to(SOURCE_DATA_DIR)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if scale == 1:
+            shutil.copyfile(src, dest)
+            with open(src, 'r', encoding='utf-8', newline='') as f:
+                rows += sum(1 for _ in csv.reader(f)) - 1
+            continue
+        with open(src, 'r', encoding='utf-8', newline='') as f:
+            header, *body = list(csv.reader(f))
+        with open(dest, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(header)
+            for _ in range(scale):
+                writer.writerows(body)
+        rows += len(body) * scale
+    return rows
+
+
+# ============ REFERENCE RANKING ============
+def _reference_tokenize(text):
+    """Tokenizer of the original engine: lowercase, strip punctuation, drop words of <= 2 chars"""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
+class ReferenceBM25:
+    """Frozen copy of the original BM25 scoring (k1=1.5, b=0.75) used as the ranking oracle"""
+
+    def __init__(self, filepath, search_cols):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            self.data = list(csv.DictReader(f))
+        corpus = [_reference_tokenize(" ".join(str(row.get(col, "")) for col in search_cols)) for row in self.data]
+        self.N = len(corpus)
+        self.doc_lengths = [len(doc) for doc in corpus]
+        self.avgdl = sum(self.doc_lengths) / self.N if self.N else 0
+        self.term_freqs = [Counter(doc) for doc in corpus]
+        doc_freqs = Counter(word for doc in corpus for word in set(doc))
+        self.idf = {word: log((self.N - freq + 0.5) / (freq + 0.5) + 1) for word, freq in doc_freqs.items()}
+
+    def search(self, query, output_cols, max_results, k1=1.5, b=0.75):
+        """Top rows with score > 0, ties kept in row order"""
+        query_tokens = _reference_tokenize(query)
+        scores = []
+        for idx, term_freqs in enumerate(self.term_freqs):
+            score = 0
+            for token in query_tokens:
+                if token in self.idf:
+                    tf = term_freqs[token]
+                    score += self.idf[token] * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * self.doc_lengths[idx] / self.avgdl))
+            scores.append((idx, score))
+        ranked = sorted(scores, key=lambda x: x[1], reverse=True)
+        return [{col: self.data[idx].get(col, "") for col in output_cols if col in self.data[idx]}
+                for idx, score in ranked[:max_results] if score > 0]
+
+
+def check_rankings(payloads, max_results):
+    """Compare engine results with the reference for every payload and available backend"""
+    import core
+    backends = core.available_backends()
+
+    references = {}
+    mismatches = []
+    for payload in payloads:
+        filepath, search_cols, output_cols = core.search_target(payload.get("domain"), payload.get("stack"))
+        if filepath not in references:
+            references[filepath] = ReferenceBM25(filepath, search_cols)
+        expected = references[filepath].search(payload["query"], output_cols, max_results)
+        index = core.get_index(filepath, search_cols)
+        for backend in backends:
+            if index.search(payload["query"], output_cols, max_results, backend=backend) != expected:
+                mismatches.append(dict(payload, backend=backend))
+    return {"checked": len(payloads), "backends": backends, "mismatches": mismatches}
+
+
+# ============ IN-PROCESS WORKER ============
+def _time_calls(calls, repeat):
+    """Time each call repeat times; returns the list of durations"""
+    samples = []
+    for _ in range(repeat):
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def worker(repeat, max_results):
+    """Warm-path measurements; runs in its own process with UIPRO_DATA_DIR pointing at scaled data"""
+    import core
+    from design_system import generate_design_system
+
+    payloads = query_corpus()
+
+    def run(payload):
+        if "stack" in payload:
+            return core.search_stack(payload["query"], payload["stack"], max_results)
+        return core.search(payload["query"], payload["domain"], max_results)
+
+    calls = [lambda p=p: run(p) for p in payloads]
+    for call in calls:  # load every index once
+        call()
+
+    cache_size = core.RESULT_CACHE.size
+    core.RESULT_CACHE.size = 0
+    core.RESULT_CACHE.clear()
+    warm = _time_calls(calls, repeat)
+    design = _time_calls([lambda b=b: generate_design_system(b) for b in DESIGN_SYSTEM_BRIEFS], repeat)
+    core.RESULT_CACHE.size = cache_size
+    cached = _time_calls(calls, repeat)
+
+    digest = hashlib.sha1(json.dumps([run(p)["results"] for p in payloads], ensure_ascii=False).encode("utf-8"))
+    return {
+        "warm_index": latency_stats(warm),
+        "cached": latency_stats(cached),
+        "design_system": latency_stats(design),
+        "results_sha1": digest.hexdigest(),
+        "rankings": check_rankings(payloads, max_results),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+# ============ ORCHESTRATION ============
+def _search_args(payload, max_results):
+    """search.py command line for a corpus payload"""
+    target = ["--stack", payload["stack"]] if "stack" in payload else ["--domain", payload["domain"]]
+    return [str(SCRIPTS_DIR / "search.py"), payload["query"]] + target + ["-n", str(max_results), "--json", "--no-daemon"]
+
+
+def bench_scale(scale, workdir, repeat, max_results):
+    """All measurements for one synthetic data scale"""
+    data_dir = workdir / f"data-x{scale}"
+    rows = make_scaled_data(data_dir, scale)
+    env = dict(os.environ, UIPRO_DATA_DIR=str(data_dir))
+    for name in ("UIPRO_RESULT_CACHE_DISK", "UIPRO_BM25_BACKEND"):
+        env.pop(name, None)
+
+    payloads = query_corpus()
+    # One payload per CSV: the first invocation builds that file's index
+    # (keyed by kind too, since the "react" domain and the "react" stack are different files)
+    first = {}
+    for payload in payloads:
+        key = ("stack", payload["stack"]) if "stack" in payload else ("domain", payload["domain"])
+        first.setdefault(key, payload)
+    first = list(first.values())
+
+    build, build_rss = [], []
+    for payload in first:
+        elapsed, _, rss = run_process(_search_args(payload, max_results), env)
+        build.append(elapsed)
+        build_rss.append(rss)
+    start = [run_process(_search_args(payload, max_results), env)[0] for payload in first]
+
+    batch_input = "".join(json.dumps(dict(p, max_results=max_results)) + "\n" for p in payloads)
+    batch_seconds, batch_output, batch_rss = run_process([str(SCRIPTS_DIR / "search.py"), "--batch"], env, batch_input)
+    batch_errors = sum(1 for line in batch_output.splitlines() if "error" in json.loads(line))
+
+    _, worker_output, _ = run_process([str(Path(__file__)), "--worker", "--repeat", str(repeat),
+                                       "--max-results", str(max_results)], env)
+    result = {
+        "rows": rows,
+        "cold_build": dict(latency_stats(build), peak_rss_mb=max(build_rss) if None not in build_rss else None),
+        "cold_start": latency_stats(start),
+        "batch": {
+            "queries": len(payloads),
+            "errors": batch_errors,
+            "seconds": round(batch_seconds, 3),
+            "qps": round(len(payloads) / batch_seconds, 1),
+            "peak_rss_mb": batch_rss
+        }
+    }
+    result.update(json.loads(worker_output))
+    return result
+
+
+def _git_commit():
+    """Current commit of the repository, if any"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(scales, repeat, max_results):
+    """Benchmark every scale in a scratch directory and return the report"""
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "max_results": max_results
+        },
+        "scales": {}
+    }
+    workdir = Path(tempfile.mkdtemp(prefix="uipro-bench-"))
+    try:
+        for scale in scales:
+            print(f"  scale x{scale}...", file=sys.stderr)
+            report["scales"][str(scale)] = bench_scale(scale, workdir, repeat, max_results)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+# ============ REPORTING ============
+METRICS = ["cold_build", "cold_start", "warm_index", "cached", "design_system"]
+
+
+def format_report(report, baseline=None):
+    """Human-readable summary, with deltas against a baseline report"""
+    lines = [f"UI Pro Max benchmark @ {report['meta']['commit']} (python {report['meta']['python']})"]
+    for scale, result in report["scales"].items():
+        base = (baseline or {}).get("scales", {}).get(scale)
+        lines.append(f"\nx{scale} ({result['rows']} rows, worker peak RSS {result['peak_rss_mb']} MB)")
+        for metric in METRICS:
+            stats = result[metric]
+            line = f"  {metric:<14} p50 {stats['p50_ms']:>10.3f} ms   p99 {stats['p99_ms']:>10.3f} ms"
+            if base and metric in base:
+                delta = (stats["p50_ms"] - base[metric]["p50_ms"]) / base[metric]["p50_ms"] * 100 if base[metric]["p50_ms"] else 0
+                line += f"   ({delta:+.1f}% p50)"
+            lines.append(line)
+        batch = result["batch"]
+        line = f"  {'batch':<14} {batch['qps']:>10.1f} q/s   {batch['queries']} queries in {batch['seconds']} s"
+        if base:
+            line += f"   ({(batch['qps'] - base['batch']['qps']) / base['batch']['qps'] * 100:+.1f}% q/s)"
+        lines.append(line)
+        rankings = result["rankings"]
+        lines.append(f"  rankings       {rankings['checked']} queries x {'/'.join(rankings['backends'])}: "
+                     f"{len(rankings['mismatches'])} mismatches")
+        if base and base.get("results_sha1") != result["results_sha1"]:
+            lines.append(f"  results changed since baseline ({base.get('results_sha1')} -> {result['results_sha1']})")
+    return "\n".join(lines)
+
+
+def has_mismatches(report):
+    """Whether any scale produced rankings that differ from the reference"""
+    return any(result["rankings"]["mismatches"] for result in report["scales"].values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max search benchmark")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated data scale factors (default: 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of the query corpus per warm measurement")
+    parser.add_argument("--max-results", "-n", type=int, default=3, help="Results per query (default: 3)")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to show deltas against")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.repeat, args.max_results)))
+        raise SystemExit(0)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = run_benchmark(scales, args.repeat, args.max_results)
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(format_report(report, baseline))
+    raise SystemExit(1 if has_mismatches(report) else 0)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Client - forwards queries to a running search daemon (server.py).
+
+Kept separate from server.py and free of http.client so that a plain search.py call,
+which probes for a daemon first, only pays for a socket connect.
+"""
+
+import json
+import os
+import socket
+
+
+# ============ CONFIGURATION ============
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("UIPRO_SEARCH_PORT", "8765"))
+CLIENT_TIMEOUT = 10
+# Plain search.py calls fall back to in-process search, so a hung or busy daemon must not stall them
+FORWARD_TIMEOUT = float(os.environ.get("UIPRO_FORWARD_TIMEOUT", "1"))
+
+
+# ============ CLIENT ============
+def request(payload: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = CLIENT_TIMEOUT):
+    """Forward a query to a running daemon; returns None when none is reachable.
+
+    timeout bounds the connect and each read; search.py's opportunistic forward uses FORWARD_TIMEOUT.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    head = (f"POST /search HTTP/1.0\r\nHost: {host}:{port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode("ascii")
+    chunks = []
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as conn:
+            conn.sendall(head + body)
+            # HTTP/1.0: the daemon closes the connection after the response
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    status_line, _, rest = b"".join(chunks).partition(b"\r\n")
+    status = status_line.split()
+    if len(status) < 2 or status[1] != b"200":
+        return None
+    try:
+        return json.loads(rest.partition(b"\r\n\r\n")[2])
+    except ValueError:
+        return None
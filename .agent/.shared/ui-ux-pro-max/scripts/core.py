@@ -5,15 +5,39 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import io
+import json
+import os
 import re
+import sys
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
 
 # ============ CONFIGURATION ============
-DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR = Path(os.environ.get("UIPRO_DATA_DIR") or Path(__file__).parent.parent / "data")
+INDEX_DIR = DATA_DIR / ".index"
+INDEX_VERSION = 2
 MAX_RESULTS = 3
 
+# Scoring backend: "python", "sparse" (NumPy + SciPy) or "auto" (sparse for large CSVs when available)
+BM25_BACKEND = os.environ.get("UIPRO_BM25_BACKEND", "auto")
+SPARSE_MIN_DOCS = 5000
+
+# Search result cache: in-memory LRU, plus an on-disk tier shared by CLI runs when enabled
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL = float(os.environ.get("UIPRO_RESULT_CACHE_TTL", "900"))
+RESULT_CACHE_DISK = os.environ.get("UIPRO_RESULT_CACHE_DISK", "") not in ("", "0")
+RESULT_CACHE_DISK_MAX = 4 * RESULT_CACHE_SIZE
+RESULT_CACHE_PRUNE_EVERY = 64
+
+# Per-stage timing (see PROFILER); search.py --profile turns it on for one run
+PROFILE = os.environ.get("UIPRO_PROFILE", "") not in ("", "0")
+
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
@@ -96,99 +120,914 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ PROFILING ============
+class Profiler:
+    """Opt-in wall time and call counts per named stage (index.build, search.score, ...).
+
+    Stages nest, so totals are inclusive (index.build includes bm25.fit). Stages timed on
+    worker threads are summed across threads and can add up to more than the wall time.
+    """
+
+    REPORT_VERSION = 1
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop recorded stages and restart the wall clock"""
+        with self._lock:
+            self.stages = {}
+            self.started = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager timing one call of a stage; a shared no-op while disabled"""
+        return _StageTimer(self, name) if self.enabled else _NO_STAGE
+
+    def record(self, name, seconds, calls=1, longest=None):
+        """Add calls to a stage's totals"""
+        with self._lock:
+            stat = self.stages.get(name)
+            if stat is None:
+                stat = self.stages[name] = [0, 0.0, 0.0]
+            stat[0] += calls
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds if longest is None else longest)
+
+    def take(self):
+        """Recorded stages as {name: [calls, total_s, max_s]}, clearing them (for merge() elsewhere)"""
+        with self._lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    def merge(self, stages):
+        """Fold in stages recorded by another process's profiler (its take() output)"""
+        for name, (calls, total, longest) in stages.items():
+            self.record(name, total, calls, longest)
+
+    def report(self, **extra):
+        """JSON-ready report: wall time plus calls, total, mean and max ms per stage"""
+        with self._lock:
+            stages = {name: list(stat) for name, stat in self.stages.items()}
+            wall = time.perf_counter() - self.started
+        report = {"version": self.REPORT_VERSION, "wall_ms": round(wall * 1000, 3)}
+        report.update(extra)
+        report["stages"] = {
+            name: {
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / calls, 3),
+                "max_ms": round(longest * 1000, 3)
+            }
+            for name, (calls, total, longest) in sorted(stages.items())
+        }
+        return report
+
+    def write(self, path, **extra):
+        """Write report() as JSON to path"""
+        path = Path(path)
+        _write_atomic(path, json.dumps(self.report(**extra), indent=2, ensure_ascii=False) + "\n")
+        return path
+
+
+class _StageTimer:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+PROFILER = Profiler(PROFILE)
+
+
+# ============ TOKENIZER ============
+STOPWORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "are", "was", "were", "but", "not", "you", "your",
+    "all", "any", "can", "has", "have", "had", "its", "from", "into", "onto", "than", "then", "them",
+    "they", "their", "there", "these", "those", "will", "would", "should", "could", "use", "using",
+    "via", "per", "each", "such", "also", "only", "when", "where", "which", "while", "who", "how"
+})
+
+
+def light_stem(word):
+    """Strip common English suffixes (plurals, -ing, -ed, -ly); cheap, not linguistically exact"""
+    for suffix in ("ing", "ed", "ly", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                break
+            return word[:-len(suffix)]
+    return word
+
+
+STEMMERS = {"light": light_stem}
+
+
+class Tokenizer:
+    """Lowercase, replace punctuation with spaces, drop words of 2 characters or fewer.
+
+    Optional stopword removal, stemming (by name from STEMMERS) and word n-grams.
+    Results are memoised per text (CSV columns such as Keywords / Best For repeat
+    heavily) and tokens are interned so the vocabulary is stored once.
+    """
+
+    _PUNCT = re.compile(r'[^\w\s]')
+
+    def __init__(self, min_len=3, stopwords=False, stemmer=None, ngrams=1, cache_size=8192):
+        self.min_len = min_len
+        self.stopwords = stopwords
+        self.stemmer = stemmer
+        self.ngrams = ngrams
+        self._stopwords = STOPWORDS if stopwords else frozenset()
+        self._stem = STEMMERS[stemmer] if stemmer else None
+        self._cached = lru_cache(maxsize=cache_size)(self._tokenize)
+
+    def _tokenize(self, text):
+        words = self._PUNCT.sub(' ', text.lower()).split()
+        tokens = [w for w in words if len(w) >= self.min_len and w not in self._stopwords]
+        if self._stem:
+            tokens = [self._stem(w) for w in tokens]
+        if self.ngrams > 1:
+            grams = []
+            for n in range(2, self.ngrams + 1):
+                grams.extend("_".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            tokens.extend(grams)
+        return tuple(sys.intern(w) for w in tokens)
+
+    def __call__(self, text):
+        """Tokens of text as a tuple (shared between identical inputs)"""
+        return self._cached(text if isinstance(text, str) else str(text))
+
+    def tokenize_fields(self, fields):
+        """Tokens of several fields; same as joining them with spaces, except n-grams never span fields"""
+        tokens = []
+        for field in fields:
+            tokens.extend(self(field))
+        return tokens
+
+    def config(self):
+        """Settings that affect the token stream, stored with persisted indexes"""
+        return {"min_len": self.min_len, "stopwords": self.stopwords, "stemmer": self.stemmer, "ngrams": self.ngrams}
+
+
+DEFAULT_TOKENIZER = Tokenizer()
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.postings = {}
+        self.norms = []
         self.N = 0
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return self.tokenizer(text)
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index from documents (strings, or sequences of field strings)"""
+        corpus = [self.tokenizer(doc) if isinstance(doc, str) else self.tokenizer.tokenize_fields(doc)
+                  for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Inverted index: token -> [[doc_idx, term frequency], ...] in doc order
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            for word, tf in Counter(doc).items():
+                postings[word].append([idx, tf])
+        self.postings = dict(postings)
 
-        for word, freq in self.doc_freqs.items():
+        for word, docs in self.postings.items():
+            freq = len(docs)
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        self._precompute_norms()
+
+    def _precompute_norms(self):
+        """Cache the length-normalisation term of the BM25 denominator per document"""
+        self.norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+
+    def _accumulate(self, query):
+        """Sum BM25 contributions per document by walking query-token postings"""
+        scores = {}
+        for token in self.tokenize(query):
+            if token not in self.idf:
+                continue
+            idf = self.idf[token]
+            for idx, tf in self.postings[token]:
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.norms[idx]
+                scores[idx] = scores.get(idx, 0) + idf * numerator / denominator
+        return scores
 
     def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        """Score documents sharing at least one token with query, best first"""
+        return sorted(self._accumulate(query).items(), key=_rank_key, reverse=True)
+
+    def top_k(self, query, k):
+        """Best k (doc_idx, score) pairs without sorting every candidate"""
+        return heapq.nlargest(k, self._accumulate(query).items(), key=_rank_key)
+
+    def top_k_many(self, queries, k):
+        """top_k() for each query"""
+        return [self.top_k(query, k) for query in queries]
+
+    def state(self):
+        """Serializable snapshot of the fitted index"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer.config(),
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore a fitted index from state() output"""
+        bm25 = cls(state["k1"], state["b"], _tokenizer_for(state["tokenizer"]))
+        bm25.doc_lengths = state["doc_lengths"]
+        bm25.N = len(bm25.doc_lengths)
+        if bm25.N:
+            bm25.avgdl = sum(bm25.doc_lengths) / bm25.N
+        bm25.idf = state["idf"]
+        bm25.postings = state["postings"]
+        bm25._precompute_norms()
+        return bm25
+
+
+def _tokenizer_for(config):
+    """Reuse the shared default tokenizer (and its cache) when settings match"""
+    return DEFAULT_TOKENIZER if config == DEFAULT_TOKENIZER.config() else Tokenizer(**config)
+
+
+def _rank_key(item):
+    """Order by score, ties broken by original row order"""
+    return item[1], -item[0]
+
+
+# ============ VECTORIZED BACKEND (optional) ============
+_SPARSE_MODULES = None
+
+
+def _sparse_modules():
+    """Import NumPy/SciPy on first use; None when they are not installed"""
+    global _SPARSE_MODULES
+    if _SPARSE_MODULES is None:
+        try:
+            import numpy
+            from scipy import sparse
+            _SPARSE_MODULES = (numpy, sparse)
+        except ImportError:
+            _SPARSE_MODULES = False
+    return _SPARSE_MODULES or None
+
+
+def available_backends():
+    """Scoring backends usable here: "python" always, "sparse" when NumPy and SciPy import"""
+    return ["python", "sparse"] if _sparse_modules() else ["python"]
+
+
+class SparseBM25:
+    """BM25 scoring as a sparse matrix product over precomputed term weights.
+
+    Rows are documents, columns are vocabulary terms, and each cell holds the
+    full BM25 contribution of that term to that document. Vector scores pick
+    the candidates; candidates near the k-th score are then re-summed in query
+    token order so rankings match BM25 exactly.
+    """
+
+    # Relative slack kept around the k-th vector score before exact re-ranking
+    TOLERANCE = 1e-9
+
+    def __init__(self, bm25):
+        np, sparse = _sparse_modules()
+        self.np = np
+        self.bm25 = bm25
+        self.vocab = {token: col for col, token in enumerate(bm25.postings)}
+        rows, cols, weights = [], [], []
+        for token, docs in bm25.postings.items():
+            col = self.vocab[token]
+            idf = bm25.idf[token]
+            for idx, tf in docs:
+                rows.append(idx)
+                cols.append(col)
+                weights.append(idf * (tf * (bm25.k1 + 1)) / (tf + bm25.norms[idx]))
+        self.weights = sparse.csr_matrix(
+            (np.array(weights, dtype=np.float64), (rows, cols)), shape=(bm25.N, len(self.vocab)))
+        self.sparse = sparse
+
+    def _query_columns(self, queries):
+        """Token columns per query plus a (vocab x queries) count matrix"""
+        token_cols, rows, cols = [], [], []
+        for j, query in enumerate(queries):
+            tcols = [self.vocab[t] for t in self.bm25.tokenize(query) if t in self.vocab]
+            token_cols.append(tcols)
+            rows.extend(tcols)
+            cols.extend([j] * len(tcols))
+        counts = self.sparse.csc_matrix(
+            (self.np.ones(len(rows), dtype=self.np.float64), (rows, cols)), shape=(len(self.vocab), len(queries)))
+        return token_cols, counts
+
+    def _exact(self, docs, tcols):
+        """Re-sum candidate scores column by column in query token order, as BM25 does"""
+        columns = self.weights[docs][:, tcols].toarray()
+        exact = columns[:, 0].copy()
+        for c in range(1, len(tcols)):
+            exact += columns[:, c]
+        return exact
+
+    def top_k_many(self, queries, k):
+        """Best k (doc_idx, score) pairs for every query from one matrix product"""
+        token_cols, counts = self._query_columns(queries)
+        scores = (self.weights @ counts).tocsc()
+        results = []
+        for j, tcols in enumerate(token_cols):
+            start, end = scores.indptr[j], scores.indptr[j + 1]
+            docs, vals = scores.indices[start:end], scores.data[start:end]
+            if k < len(vals):
+                kth = self.np.partition(vals, len(vals) - k)[len(vals) - k]
+                docs = docs[vals >= kth * (1 - self.TOLERANCE)]
+            if len(docs) == 0:
+                results.append([])
+                continue
+            exact = self._exact(docs, tcols)
+            results.append(heapq.nlargest(k, zip(docs.tolist(), exact.tolist()), key=_rank_key))
+        return results
+
+    def top_k(self, query, k):
+        """Best k (doc_idx, score) pairs for one query"""
+        return self.top_k_many([query], k)[0]
+
+
+# ============ PERSISTENT INDEX ============
+def _record_offsets(raw):
+    """Byte spans [start, end) of each non-blank CSV record, header included"""
+    offsets = []
+    start = pos = quotes = 0
+    size = len(raw)
+    while pos < size:
+        nl = raw.find(b"\n", pos)
+        end = size if nl == -1 else nl + 1
+        quotes += raw.count(b'"', pos, end)
+        pos = end
+        # A record only ends on a newline outside quotes ("" escapes keep parity even)
+        if quotes % 2 == 0:
+            if raw[start:end].strip(b"\r\n"):
+                offsets.append([start, end])
+            start = end
+    if start < size and raw[start:].strip(b"\r\n"):
+        offsets.append([start, size])
+    return offsets
+
+
+def _decode(chunk):
+    """Decode CSV bytes with the newline translation of text-mode open()"""
+    return chunk.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _parse_record(chunk):
+    """Parse one raw CSV record into a list of fields"""
+    return next(csv.reader(io.StringIO(_decode(chunk))), [])
+
+
+def _positions(fieldnames, columns):
+    """[(column, field position)] for columns in the header; last duplicate wins, like csv.DictReader"""
+    positions = {name: i for i, name in enumerate(fieldnames)}
+    return [(col, positions[col]) for col in columns if col in positions]
+
+
+def _project(values, positions):
+    """Dict of the selected columns; short records yield None like csv.DictReader"""
+    size = len(values)
+    return {col: values[i] if i < size else None for col, i in positions}
+
+
+def _search_documents(raw, spans, search_cols):
+    """Header plus the searched columns of every record, streamed so other columns are never kept"""
+    # One reader over per-record chunks: each span holds exactly one (possibly multi-line) record
+    records = csv.reader(_decode(raw[start:end]) for start, end in spans)
+    fieldnames = next(records, [])
+    positions = _positions(fieldnames, search_cols)
+    documents = []
+    for values in records:
+        row = _project(values, positions)
+        documents.append([str(row.get(col, "")) for col in search_cols])
+    return fieldnames, documents
+
+
+def _sha1(data):
+    """Hex SHA-1; hashlib is imported here because a search against a fresh index never needs it"""
+    import hashlib
+    return hashlib.sha1(data).hexdigest()
+
+
+def _fingerprint(filepath, digest=True):
+    """Cheap stat fingerprint, optionally with a content hash"""
+    stat = filepath.stat()
+    fp = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if digest:
+        fp["sha1"] = _sha1(filepath.read_bytes())
+    return fp
+
+
+def _check_source(filepath, stored):
+    """(fresh, source) for a stored fingerprint; source is refreshed when only the mtime moved"""
+    current = _fingerprint(filepath, digest=False)
+    if current["mtime_ns"] == stored["mtime_ns"] and current["size"] == stored["size"]:
+        return True, stored
+    if current["size"] == stored["size"]:
+        # Touched but possibly unchanged: fall back to the content hash
+        current = _fingerprint(filepath)
+        if current["sha1"] == stored["sha1"]:
+            return True, current
+    return False, stored
+
+
+def _index_path(filepath):
+    """Location of the compiled index for a CSV under data/.index/"""
+    try:
+        rel = filepath.resolve().relative_to(DATA_DIR.resolve())
+    except ValueError:
+        rel = Path(_sha1(str(filepath.resolve()).encode())[:16])
+    return INDEX_DIR / rel.with_suffix(".json")
+
+
+def _temp_path(path):
+    """Temp file next to path, unique per process and thread so concurrent writers never share one"""
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+def _write_atomic(path, text):
+    """Write via temp file + rename so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
 
-            scores.append((idx, score))
+def _state_matches(data, search_cols, tokenizer=None):
+    """Whether stored index state was built with this format, columns and tokenizer"""
+    return bool(data) and data.get("version") == INDEX_VERSION and data.get("search_cols") == list(search_cols) \
+        and data["bm25"].get("tokenizer") == (tokenizer or DEFAULT_TOKENIZER).config()
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+class CSVIndex:
+    """Compiled BM25 index over one CSV file, persisted under data/.index/"""
+
+    def __init__(self, filepath, search_cols, fieldnames, offsets, bm25, source):
+        self.filepath = filepath
+        self.search_cols = search_cols
+        self.fieldnames = fieldnames
+        self.offsets = offsets
+        self.bm25 = bm25
+        self.source = source
+        self._scorers = {}
+
+    @classmethod
+    def build(cls, filepath, search_cols, tokenizer=None):
+        """Parse the CSV once and fit a fresh BM25 index"""
+        with PROFILER.stage("index.build"):
+            with PROFILER.stage("csv.parse"):
+                raw = filepath.read_bytes()
+                spans = _record_offsets(raw)
+                # Only the searched columns are kept; output columns are read per hit via offsets
+                fieldnames, documents = _search_documents(raw, spans, search_cols)
+            offsets = spans[1:]
+
+            with PROFILER.stage("bm25.fit"):
+                bm25 = BM25(tokenizer=tokenizer)
+                bm25.fit(documents)
+            stat = filepath.stat()
+            source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": _sha1(raw)}
+            return cls(filepath, list(search_cols), fieldnames, offsets, bm25, source)
+
+    @classmethod
+    def load(cls, filepath, search_cols, tokenizer=None):
+        """Load the compiled index, rebuilding it if the CSV or tokenizer settings changed"""
+        index_path = _index_path(filepath)
+        try:
+            with PROFILER.stage("index.load"), open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        if _state_matches(data, search_cols, tokenizer):
+            fresh, source = _check_source(filepath, data["source"])
+            if fresh:
+                if source is not data["source"]:
+                    data["source"] = source
+                    cls._save(index_path, data)
+                return cls.from_state(filepath, data)
+
+        index = cls.build(filepath, search_cols, tokenizer)
+        cls._save(index_path, index.state())
+        return index
+
+    @classmethod
+    def from_state(cls, filepath, data):
+        """Restore an index from state() output"""
+        return cls(filepath, data["search_cols"], data["fieldnames"], data["offsets"],
+                   BM25.from_state(data["bm25"]), data["source"])
+
+    @staticmethod
+    def _save(index_path, data):
+        """Persist index state; a read-only data dir just means no cache"""
+        try:
+            _write_atomic(index_path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        except OSError:
+            pass
+
+    def state(self):
+        """Serializable form written to data/.index/"""
+        return {
+            "version": INDEX_VERSION,
+            "source": self.source,
+            "search_cols": self.search_cols,
+            "fieldnames": self.fieldnames,
+            "offsets": self.offsets,
+            "bm25": self.bm25.state()
+        }
+
+    @property
+    def scorer(self):
+        """Scoring backend chosen by BM25_BACKEND; falls back to pure Python without NumPy/SciPy"""
+        use_sparse = BM25_BACKEND == "sparse" or (BM25_BACKEND == "auto" and self.bm25.N >= SPARSE_MIN_DOCS)
+        return self.scorer_for("sparse" if use_sparse and _sparse_modules() else "python")
+
+    def scorer_for(self, backend):
+        """Scorer for one named backend (see available_backends()), built once per index"""
+        if backend not in available_backends():
+            raise ValueError(f"Unknown or unavailable backend: {backend}. Available: {', '.join(available_backends())}")
+        scorer = self._scorers.get(backend)
+        if scorer is None:
+            scorer = self._scorers[backend] = SparseBM25(self.bm25) if backend == "sparse" else self.bm25
+        return scorer
+
+    def rows(self, idxs, columns=None):
+        """Fetch rows for the given document indexes via stored byte offsets, projected to columns"""
+        positions = _positions(self.fieldnames, self.fieldnames if columns is None else columns)
+        rows = []
+        with open(self.filepath, 'rb') as f:
+            for idx in idxs:
+                start, end = self.offsets[idx]
+                f.seek(start)
+                rows.append(_project(_parse_record(f.read(end - start)), positions))
+        return rows
+
+    def _hits(self, ranked, output_cols):
+        """Output columns of ranked hits with score > 0"""
+        with PROFILER.stage("search.rows"):
+            return self.rows([idx for idx, score in ranked if score > 0], output_cols)
+
+    def search(self, query, output_cols, max_results, backend=None):
+        """Score query and return output columns of the top results with score > 0
+
+        backend forces one scorer ("python" or "sparse") instead of the BM25_BACKEND choice.
+        """
+        scorer = self.scorer if backend is None else self.scorer_for(backend)
+        with PROFILER.stage("search.score"):
+            ranked = scorer.top_k(query, max_results)
+        return self._hits(ranked, output_cols)
+
+    def search_many(self, queries, output_cols, max_results):
+        """search() for many queries, scored together in one pass by the sparse backend"""
+        with PROFILER.stage("search.score"):
+            ranked = self.scorer.top_k_many(queries, max_results)
+        return [self._hits(hits, output_cols) for hits in ranked]
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+_INDEXES = {}
+_INDEX_LOCK = threading.Lock()
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+def _warm_index(key, filepath):
+    """The in-process index for key, or None if missing or its CSV changed on disk"""
+    index = _INDEXES.get(key)
+    if index is not None:
+        stat = filepath.stat()
+        if stat.st_mtime_ns == index.source["mtime_ns"] and stat.st_size == index.source["size"]:
+            return index
+    return None
 
-    data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+def get_index(filepath, search_cols):
+    """Return a warm in-process index, reloading it when the CSV changes on disk"""
+    key = (str(filepath), tuple(search_cols))
+    index = _warm_index(key, filepath)
+    if index is None:
+        with _INDEX_LOCK:
+            # Re-check under the lock: concurrent callers only load it once
+            index = _warm_index(key, filepath)
+            if index is None:
+                index = CSVIndex.load(filepath, search_cols)
+                _INDEXES[key] = index
+    return index
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+def warm_indexes():
+    """Load every domain and stack index into memory; returns how many were loaded"""
+    sources = [(DATA_DIR / config["file"], config["search_cols"]) for config in CSV_CONFIG.values()]
+    sources += [(DATA_DIR / config["file"], _STACK_COLS["search_cols"]) for config in STACK_CONFIG.values()]
+    count = 0
+    for filepath, search_cols in sources:
+        if filepath.exists():
+            get_index(filepath, search_cols)
+            count += 1
+    return count
 
-    return results
+
+class DomainIndex:
+    """Every CSV_CONFIG domain in one index file (data/.index/_domains.json).
+
+    Each domain keeps its own BM25 statistics, so per-domain rankings are the
+    same as search(); the point is loading all of them in a single read and
+    answering cross-domain questions from one structure.
+    """
+
+    FILENAME = "_domains.json"
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    @classmethod
+    def load(cls):
+        """Load the unified index, rebuilding only the domains whose CSV changed"""
+        index_path = INDEX_DIR / cls.FILENAME
+        try:
+            with PROFILER.stage("index.load"), open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        stored = data.get("domains", {}) if data.get("version") == INDEX_VERSION else {}
+
+        indexes = {}
+        dirty = False
+        for domain, config in CSV_CONFIG.items():
+            filepath = DATA_DIR / config["file"]
+            if not filepath.exists():
+                continue
+            state = stored.get(domain)
+            index = None
+            if state and _state_matches(state, config["search_cols"]):
+                fresh, source = _check_source(filepath, state["source"])
+                if fresh:
+                    dirty = dirty or source is not state["source"]
+                    state["source"] = source
+                    index = CSVIndex.from_state(filepath, state)
+            if index is None:
+                index = CSVIndex.build(filepath, config["search_cols"])
+                dirty = True
+            indexes[domain] = index
+
+        if dirty:
+            CSVIndex._save(index_path, {
+                "version": INDEX_VERSION,
+                "domains": {domain: index.state() for domain, index in indexes.items()}
+            })
+        return cls(indexes)
+
+    def is_fresh(self):
+        """True while no domain CSV has changed size or mtime"""
+        for index in self.indexes.values():
+            stat = index.filepath.stat()
+            if stat.st_mtime_ns != index.source["mtime_ns"] or stat.st_size != index.source["size"]:
+                return False
+        return True
+
+    def rank_domains(self, query):
+        """[(domain, best BM25 score)] for domains with a match, best first"""
+        ranked = []
+        for domain, index in self.indexes.items():
+            top = index.scorer.top_k(query, 1)
+            if top and top[0][1] > 0:
+                ranked.append((domain, top[0][1]))
+        return sorted(ranked, key=lambda x: x[1], reverse=True)
+
+
+_DOMAIN_INDEX = None
+
+
+def get_domain_index():
+    """Warm unified index; its per-domain indexes also serve get_index() lookups"""
+    global _DOMAIN_INDEX
+    if _DOMAIN_INDEX is None or not _DOMAIN_INDEX.is_fresh():
+        with _INDEX_LOCK:
+            # Re-check under the lock: concurrent callers only load it once
+            if _DOMAIN_INDEX is None or not _DOMAIN_INDEX.is_fresh():
+                _DOMAIN_INDEX = DomainIndex.load()
+                for domain, index in _DOMAIN_INDEX.indexes.items():
+                    _INDEXES[(str(index.filepath), tuple(CSV_CONFIG[domain]["search_cols"]))] = index
+    return _DOMAIN_INDEX
+
+
+# ============ RESULT CACHE ============
+class ResultCache:
+    """Bounded LRU of search results with a TTL and an optional on-disk tier.
+
+    Keys include the CSV's size and mtime, so editing a data file invalidates
+    its entries without any explicit flush.
+    """
+
+    def __init__(self, size=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL, disk_dir=None,
+                 disk_max=RESULT_CACHE_DISK_MAX):
+        self.size = size
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.disk_max = disk_max
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_puts = 0
+
+    def _disk_path(self, key):
+        """One small JSON file per key (keys are strings)"""
+        return self.disk_dir / f"{_sha1(key.encode('utf-8'))}.json"
+
+    def get(self, key):
+        """Cached rows for key, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, rows = entry
+                if expires > time.time():
+                    self._entries.move_to_end(key)
+                    return [dict(row) for row in rows]
+                del self._entries[key]
+
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                expires, rows = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if expires <= time.time():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        self._remember(key, expires, rows)
+        return [dict(row) for row in rows]
+
+    def put(self, key, rows):
+        """Store rows under key for ttl seconds"""
+        expires = time.time() + self.ttl
+        self._remember(key, expires, [dict(row) for row in rows])
+        if self.disk_dir is not None:
+            try:
+                _write_atomic(self._disk_path(key), json.dumps([expires, rows], ensure_ascii=False))
+            except OSError:
+                pass
+            with self._lock:
+                prune = self._disk_puts % RESULT_CACHE_PRUNE_EVERY == 0
+                self._disk_puts += 1
+            if prune:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Drop expired files, then the oldest ones beyond disk_max.
+
+        Runs on the first disk write of each process and every
+        RESULT_CACHE_PRUNE_EVERY writes after, so one-shot CLI runs keep the
+        tier bounded too. A file's mtime is its put time, so expiry needs no read.
+        """
+        now = time.time()
+        live = []
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+                if mtime + self.ttl <= now:
+                    path.unlink()
+                else:
+                    live.append((mtime, path))
+            except OSError:
+                pass
+        live.sort()
+        for _, path in live[:max(0, len(live) - self.disk_max)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _remember(self, key, expires, rows):
+        with self._lock:
+            self._entries[key] = (expires, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry, on disk too"""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir is not None and self.disk_dir.exists():
+            for path in self.disk_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+RESULT_CACHE = ResultCache(disk_dir=INDEX_DIR / "results" if RESULT_CACHE_DISK else None)
+
+
+def _result_key(filepath, search_cols, output_cols, query, max_results, stat):
+    """RESULT_CACHE key: normalised query plus the CSV's fingerprint"""
+    key = [str(filepath), list(search_cols), list(output_cols), " ".join(DEFAULT_TOKENIZER(query)),
+           max_results, stat.st_mtime_ns, stat.st_size]
+    return json.dumps(key, ensure_ascii=False)
+
+
+def _cached_search(filepath, search_cols, output_cols, query, max_results, index=None):
+    """index.search() behind RESULT_CACHE, keyed on normalised query and the CSV's fingerprint"""
+    with PROFILER.stage("search"):
+        key = _result_key(filepath, search_cols, output_cols, query, max_results, filepath.stat())
+        rows = RESULT_CACHE.get(key)
+        if rows is None:
+            index = index or get_index(filepath, search_cols)
+            rows = index.search(query, output_cols, max_results)
+            RESULT_CACHE.put(key, rows)
+        return rows
+
+
+def _cached_search_many(filepath, search_cols, output_cols, queries, max_results):
+    """_cached_search() for many queries: cache misses are deduplicated and scored in one pass"""
+    with PROFILER.stage("search.batch"):
+        stat = filepath.stat()
+        keys = [_result_key(filepath, search_cols, output_cols, query, max_results, stat) for query in queries]
+        found = {}
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key in found or key in missing:
+                continue
+            rows = RESULT_CACHE.get(key)
+            if rows is None:
+                missing[key] = query
+            else:
+                found[key] = rows
+        if missing:
+            index = get_index(filepath, search_cols)
+            for key, rows in zip(missing, index.search_many(list(missing.values()), output_cols, max_results)):
+                RESULT_CACHE.put(key, rows)
+                found[key] = rows
+        return [[dict(row) for row in found[key]] for key in keys]
+
+
+def clear_caches():
+    """Forget in-process indexes and cached results (e.g. after pointing DATA_DIR elsewhere)"""
+    global _DOMAIN_INDEX
+    with _INDEX_LOCK:
+        _INDEXES.clear()
+        _DOMAIN_INDEX = None
+    RESULT_CACHE.clear()
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results):
+    """Core search function using BM25"""
+    if not filepath.exists():
+        return []
+
+    return _cached_search(filepath, search_cols, output_cols, query, max_results)
 
 
 def detect_domain(query):
@@ -211,7 +1050,23 @@ def detect_domain(query):
 
     scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
     best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
+    if scores[best] > 0:
+        return best
+
+    # No keyword hit: let the domain whose data ranks the query highest decide
+    ranked = get_domain_index().rank_domains(query)
+    return ranked[0][0] if ranked else "style"
+
+
+def _domain_result(domain, query, file, results):
+    """Result envelope shared by search() and search_all()"""
+    return {
+        "domain": domain,
+        "query": query,
+        "file": file,
+        "count": len(results),
+        "results": results
+    }
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
@@ -226,14 +1081,53 @@ def search(query, domain=None, max_results=MAX_RESULTS):
         return {"error": f"File not found: {filepath}", "domain": domain}
 
     results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    return _domain_result(domain, query, config["file"], results)
 
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+
+def search_batch(queries, domain, max_results=MAX_RESULTS):
+    """search() for many queries against one domain; repeated queries are scored once"""
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+    filepath = DATA_DIR / config["file"]
+
+    if not filepath.exists():
+        return [{"error": f"File not found: {filepath}", "domain": domain} for _ in queries]
+
+    results = _cached_search_many(filepath, config["search_cols"], config["output_cols"], queries, max_results)
+    return [_domain_result(domain, query, config["file"], rows) for query, rows in zip(queries, results)]
+
+
+def search_all(query, max_results=MAX_RESULTS, domains=None):
+    """Search many domains from the unified index; returns {domain: search() result}
+
+    max_results is either one limit for every domain or a {domain: limit} dict.
+    """
+    domains = list(domains or CSV_CONFIG)
+    # Unknown domains get an error envelope, like search_stack() gives unknown stacks
+    unknown = {domain: {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}", "domain": domain}
+               for domain in domains if domain not in CSV_CONFIG}
+    unified = get_domain_index() if len(unknown) < len(domains) else None
+    results = {}
+    for domain in domains:
+        if domain in unknown:
+            results[domain] = unknown[domain]
+            continue
+        limit = max_results.get(domain, MAX_RESULTS) if isinstance(max_results, dict) else max_results
+        config = CSV_CONFIG[domain]
+        index = unified.indexes.get(domain)
+        if index is None:
+            results[domain] = {"error": f"File not found: {DATA_DIR / config['file']}", "domain": domain}
+            continue
+        rows = _cached_search(index.filepath, config["search_cols"], config["output_cols"], query, limit, index)
+        results[domain] = _domain_result(domain, query, config["file"], rows)
+    return results
+
+
+def search_target(domain=None, stack=None):
+    """(filepath, search_cols, output_cols) that search() or search_stack() reads for a domain or stack"""
+    if stack is not None:
+        return DATA_DIR / STACK_CONFIG[stack]["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+    config = CSV_CONFIG[domain]
+    return DATA_DIR / config["file"], config["search_cols"], config["output_cols"]
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
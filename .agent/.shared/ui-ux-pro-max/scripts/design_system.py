@@ -11,14 +11,32 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Stream straight to a file handle instead of building the string
+    generate_design_system("SaaS dashboard", "My Project", out=sys.stdout)
+
+    # Many briefs in one run (shared generator, worker pool)
+    report = generate_bulk(load_briefs("briefs.csv"), output_dir="out", workers=4)
 """
 
 import csv
+import hashlib
 import json
 import os
+import re
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import accumulate, chain
 from pathlib import Path
-from core import search, DATA_DIR
+from typing import Iterable, Iterator, TextIO
+import core
+from core import search, search_all, search_batch, get_domain_index, CSV_CONFIG, DATA_DIR, PROFILER
+from core import _check_source, _fingerprint, _index_path, _sha1, _temp_path, _write_atomic
 
 
 # ============ CONFIGURATION ============
@@ -32,64 +50,275 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Best style match: a priority keyword scores the weight of the first field, in order, that
+# contains it; "*" is any field name or value. A Match_Weights column in ui-reasoning.csv
+# ("Style Category=10; Keywords=3; *=1") overrides this per category.
+STYLE_NAME_FIELD = "Style Category"
+ANY_FIELD = "*"
+DEFAULT_MATCH_WEIGHTS = [[STYLE_NAME_FIELD, 10], ["Keywords", 3], [ANY_FIELD, 1]]
 
-# ============ DESIGN SYSTEM GENERATOR ============
-class DesignSystemGenerator:
-    """Generates design system recommendations from aggregated searches."""
+# Domains whose search doesn't depend on the product category (style uses its priority keywords)
+INDEPENDENT_DOMAINS = ["color", "landing", "typography"]
 
-    def __init__(self):
-        self.reasoning_data = self._load_reasoning()
 
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
-
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
-        for domain, config in SEARCH_CONFIG.items():
-            if domain == "style" and style_priority:
-                # For style, also search with priority keywords
-                priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
-            else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+# ============ REASONING INDEX ============
+class ReasoningIndex:
+    """
+    Lookup structure over the reasoning rules, built once when they are loaded.
 
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
+    find() follows the original precedence - exact UI_Category match, then partial
+    (substring either way), then any category keyword inside the query category -
+    and the first rule in file order wins at each step. Instead of scanning every rule
+    it looks up the query's substrings in hash maps and narrows reverse substring
+    matches with a trigram index, so lookups stay cheap as the table grows.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.categories = [(rule.get("UI_Category") or "").lower() for rule in rules]
+        self.exact = {}         # lowercased UI_Category -> first rule position
+        self.keywords = {}      # UI_Category keyword -> first rule position
+        self.trigrams = {}      # trigram -> positions of categories containing it
+        for pos, ui_cat in enumerate(self.categories):
+            self.exact.setdefault(ui_cat, pos)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                self.keywords.setdefault(kw, pos)
+            for gram in {ui_cat[i:i + 3] for i in range(len(ui_cat) - 2)}:
+                self.trigrams.setdefault(gram, []).append(pos)
+        self._exact_lengths = sorted({len(key) for key in self.exact})
+        self._keyword_lengths = sorted({len(key) for key in self.keywords})
+
+    @staticmethod
+    def _first_substring(text: str, table: dict, lengths: list):
+        """Lowest position among table keys that occur in text."""
+        best = None
+        for n in lengths:
+            if n > len(text):
+                break
+            for i in range(len(text) - n + 1):
+                pos = table.get(text[i:i + n])
+                if pos is not None and (best is None or pos < best):
+                    best = pos
+        return best
+
+    def _first_containing(self, text: str):
+        """Lowest position whose category contains text."""
+        if len(text) < 3:
+            candidates = range(len(self.categories))
+        else:
+            postings = [self.trigrams.get(text[i:i + 3], []) for i in range(len(text) - 2)]
+            candidates = min(postings, key=len)
+        for pos in candidates:
+            if text in self.categories[pos]:
+                return pos
+        return None
+
+    def lookup(self, category: str):
+        """Position of the matching rule for a category, or None."""
         category_lower = category.lower()
 
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
+        if category_lower in self.exact:
+            return self.exact[category_lower]
 
         # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
+        matches = [pos for pos in (self._first_substring(category_lower, self.exact, self._exact_lengths),
+                                   self._first_containing(category_lower)) if pos is not None]
+        if matches:
+            return min(matches)
 
         # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+        return self._first_substring(category_lower, self.keywords, self._keyword_lengths)
 
-        return {}
+    def find(self, category: str) -> dict:
+        """Matching rule for a category, or {}."""
+        pos = self.lookup(category)
+        return self.rules[pos] if pos is not None else {}
+
+
+class ReasoningTable:
+    """
+    ui-reasoning.csv compiled into per-rule records, cached in data/.index/.
+
+    Each record is the reasoning dict the generator applies, with Decision_Rules already
+    decoded, Style_Priority split and the optional Match_Weights column parsed (defaults
+    otherwise), so resolving a category costs a lookup rather than JSON decoding. The
+    cache is invalidated when the CSV's size/mtime and content hash no longer match.
+    """
+
+    VERSION = 2
+
+    def __init__(self, rows: list, records: list, source: dict = None):
+        self.rows = rows
+        self.records = records
+        self.source = source
+        self.index = ReasoningIndex(rows)
+
+    @staticmethod
+    def compile_record(row: dict) -> dict:
+        """Reasoning dict for one CSV row."""
+        decision_rules = {}
+        try:
+            decision_rules = json.loads(row.get("Decision_Rules", "{}"))
+        except json.JSONDecodeError:
+            pass
+
+        return {
+            "pattern": row.get("Recommended_Pattern", ""),
+            "style_priority": [s.strip() for s in row.get("Style_Priority", "").split("+")],
+            "color_mood": row.get("Color_Mood", ""),
+            "typography_mood": row.get("Typography_Mood", ""),
+            "key_effects": row.get("Key_Effects", ""),
+            "anti_patterns": row.get("Anti_Patterns", ""),
+            "decision_rules": decision_rules,
+            "severity": row.get("Severity", "MEDIUM"),
+            "match_weights": ReasoningTable.parse_match_weights(row.get("Match_Weights", ""))
+        }
+
+    @staticmethod
+    def parse_match_weights(spec: str) -> list:
+        """[[field, weight], ...] from "Field=weight; ..."; malformed entries are skipped, empty means defaults."""
+        weights = []
+        for entry in (spec or "").split(";"):
+            field, _, weight = entry.partition("=")
+            try:
+                weights.append([field.strip(), float(weight)])
+            except ValueError:
+                continue
+        weights = [[field, int(w) if w.is_integer() else w] for field, w in weights if field]
+        return weights or [list(pair) for pair in DEFAULT_MATCH_WEIGHTS]
+
+    @staticmethod
+    def cache_path(filepath: Path) -> Path:
+        """Compiled cache location next to the search indexes."""
+        path = _index_path(filepath)
+        return path.with_name(f"{path.stem}.rules.json")
+
+    @classmethod
+    def build(cls, filepath: Path) -> "ReasoningTable":
+        """Parse the CSV and compile every row."""
+        source = _fingerprint(filepath)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        return cls(rows, [cls.compile_record(row) for row in rows], source)
+
+    @classmethod
+    def load(cls, filepath: Path) -> "ReasoningTable":
+        """Load the compiled cache, recompiling when the CSV changed."""
+        if not filepath.exists():
+            return cls([], [])
+        cache_path = cls.cache_path(filepath)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        if data and data.get("version") == cls.VERSION:
+            fresh, source = _check_source(filepath, data["source"])
+            if fresh:
+                table = cls(data["rows"], data["records"], source)
+                if source is not data["source"]:
+                    table._save(cache_path)
+                return table
+
+        table = cls.build(filepath)
+        table._save(cache_path)
+        return table
+
+    def _save(self, cache_path: Path):
+        """Persist the compiled table; a read-only data dir just means no cache."""
+        state = {"version": self.VERSION, "source": self.source, "rows": self.rows, "records": self.records}
+        try:
+            _write_atomic(cache_path, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+        except OSError:
+            pass
+
+    def is_fresh(self, filepath: Path) -> bool:
+        """True while the CSV keeps the size/mtime it was compiled from."""
+        if self.source is None:
+            return not filepath.exists()
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return False
+        return stat.st_mtime_ns == self.source["mtime_ns"] and stat.st_size == self.source["size"]
+
+
+_REASONING_TABLES = {}
+_REASONING_LOCK = threading.Lock()
+
+
+def get_reasoning_table(filepath: Path = None) -> ReasoningTable:
+    """Shared in-process ReasoningTable, reloaded when the CSV changes on disk."""
+    filepath = filepath or DATA_DIR / REASONING_FILE
+    with _REASONING_LOCK:
+        table = _REASONING_TABLES.get(str(filepath))
+        if table is None or not table.is_fresh(filepath):
+            with PROFILER.stage("reasoning.load"):
+                table = _REASONING_TABLES[str(filepath)] = ReasoningTable.load(filepath)
+    return table
+
+
+# ============ DESIGN SYSTEM GENERATOR ============
+class DesignSystemGenerator:
+    """Generates design system recommendations from aggregated searches."""
+
+    def __init__(self, workers: int = 1):
+        """workers > 1 runs the independent domain searches concurrently on a thread pool."""
+        self.reasoning = self._load_reasoning()
+        self.reasoning_data = self.reasoning.rows
+        self.reasoning_index = self.reasoning.index
+        self._pool = None
+        if workers > 1:
+            get_domain_index()  # Warm once here so every worker thread shares it
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="design-search")
+
+    def close(self):
+        """Shut down the search pool, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _load_reasoning(self) -> ReasoningTable:
+        """Load compiled reasoning rules (shared across generators)."""
+        return get_reasoning_table(DATA_DIR / REASONING_FILE)
+
+    def _submit(self, query: str, domain: str) -> Future:
+        """Start one domain search on the pool, or run it inline when sequential."""
+        limit = SEARCH_CONFIG[domain]["max_results"]
+        if self._pool is not None:
+            return self._pool.submit(lambda: search_all(query, limit, [domain])[domain])
+        future = Future()
+        future.set_result(search_all(query, limit, [domain])[domain])
+        return future
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, pending: dict = None) -> dict:
+        """Execute searches across multiple domains from the unified index.
+
+        pending holds searches already started by generate(); results keep SEARCH_CONFIG order.
+        """
+        pending = dict(pending or {})
+        style_query = query
+        if style_priority:
+            # For style, search with priority keywords
+            priority_query = " ".join(style_priority[:2])
+            style_query = f"{query} {priority_query}"
+        for domain in SEARCH_CONFIG:
+            if domain not in pending:
+                pending[domain] = self._submit(style_query if domain == "style" else query, domain)
+        return {domain: pending[domain].result() for domain in SEARCH_CONFIG}
+
+    def _find_reasoning_rule(self, category: str) -> dict:
+        """Find matching reasoning rule for a category."""
+        return self.reasoning_index.find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        with PROFILER.stage("reasoning.lookup"):
+            pos = self.reasoning_index.lookup(category)
 
-        if not rule:
+        if pos is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -98,63 +327,53 @@ class DesignSystemGenerator:
                 "key_effects": "Subtle hover transitions",
                 "anti_patterns": "",
                 "decision_rules": {},
-                "severity": "MEDIUM"
+                "severity": "MEDIUM",
+                "match_weights": [list(pair) for pair in DEFAULT_MATCH_WEIGHTS]
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
-        return {
-            "pattern": rule.get("Recommended_Pattern", ""),
-            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
-            "color_mood": rule.get("Color_Mood", ""),
-            "typography_mood": rule.get("Typography_Mood", ""),
-            "key_effects": rule.get("Key_Effects", ""),
-            "anti_patterns": rule.get("Anti_Patterns", ""),
-            "decision_rules": decision_rules,
-            "severity": rule.get("Severity", "MEDIUM")
-        }
+        # Records are shared, so hand out copies of their mutable parts
+        record = self.reasoning.records[pos]
+        return dict(record, style_priority=list(record["style_priority"]),
+                    decision_rules=dict(record["decision_rules"]),
+                    match_weights=[list(pair) for pair in record["match_weights"]])
 
-    def _select_best_match(self, results: list, priority_keywords: list) -> dict:
-        """Select best matching result based on priority keywords."""
+    def _select_best_match(self, results: list, priority_keywords: list, weights: list = None) -> dict:
+        """Select best matching result based on priority keywords and field weights."""
         if not results:
             return {}
 
         if not priority_keywords:
             return results[0]
 
+        priorities = [priority.lower().strip() for priority in priority_keywords]
+        names = [result.get(STYLE_NAME_FIELD, "").lower() for result in results]
+
         # First: try exact style name match
-        for priority in priority_keywords:
-            priority_lower = priority.lower().strip()
-            for result in results:
-                style_name = result.get("Style Category", "").lower()
-                if priority_lower in style_name or style_name in priority_lower:
+        for priority in priorities:
+            for result, name in zip(results, names):
+                if priority in name or name in priority:
                     return result
 
-        # Second: score by keyword match in all fields
-        scored = []
-        for result in results:
-            result_str = str(result).lower()
-            score = 0
-            for kw in priority_keywords:
-                kw_lower = kw.lower().strip()
-                # Higher score for style name match
-                if kw_lower in result.get("Style Category", "").lower():
-                    score += 10
-                # Lower score for keyword field match
-                elif kw_lower in result.get("Keywords", "").lower():
-                    score += 3
-                # Even lower for other field matches
-                elif kw_lower in result_str:
-                    score += 1
-            scored.append((score, result))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[0][1] if scored and scored[0][0] > 0 else results[0]
+        # Second: score by weighted keyword match. Per keyword, each result scores the weight of
+        # the first field containing it; a field is only searched when some result reaches it
+        weights = weights or DEFAULT_MATCH_WEIGHTS
+        texts = [_match_texts(tuple(result.items())) for result in results]
+        columns = [None] * len(weights)
+        scores = [0] * len(results)
+        for priority in priorities:
+            unmatched = set(range(len(results)))
+            for n, (field, weight) in enumerate(weights):
+                if columns[n] is None:
+                    columns[n] = _MatchColumn(texts, field)
+                hits = columns[n].containing(priority) & unmatched
+                for i in hits:
+                    scores[i] += weight
+                unmatched -= hits
+                if not unmatched:
+                    break
+
+        best = max(range(len(results)), key=lambda i: (scores[i], -i))
+        return results[best] if scores[best] > 0 else results[0]
 
     def _extract_results(self, search_result: dict) -> list:
         """Extract results list from search result dict."""
@@ -162,8 +381,11 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        # Start the searches that don't need the category; with a pool they overlap steps 1-2
+        pending = {domain: self._submit(query, domain) for domain in INDEPENDENT_DOMAINS}
+
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = search_all(query, 1, ["product"])["product"]
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -174,8 +396,9 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        pending["product"] = Future()
+        pending["product"].set_result(product_result)  # Reuse product search
+        search_results = self._multi_domain_search(query, style_priority, pending)
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -183,7 +406,9 @@ class DesignSystemGenerator:
         typography_results = self._extract_results(search_results.get("typography", {}))
         landing_results = self._extract_results(search_results.get("landing", {}))
 
-        best_style = self._select_best_match(style_results, reasoning.get("style_priority", []))
+        with PROFILER.stage("select_best_match"):
+            best_style = self._select_best_match(style_results, reasoning.get("style_priority", []),
+                                                 reasoning.get("match_weights"))
         best_color = color_results[0] if color_results else {}
         best_typography = typography_results[0] if typography_results else {}
         best_landing = landing_results[0] if landing_results else {}
@@ -236,11 +461,107 @@ class DesignSystemGenerator:
         }
 
 
+@lru_cache(maxsize=4096)
+def _match_texts(items: tuple) -> dict:
+    """
+    Lowercased values of one search result's fields, plus ANY_FIELD: every field name and
+    value. Keyed on the result's items, so rows that recur across briefs are lowercased once.
+    """
+    texts = {key: str(value or "").lower() for key, value in items}
+    # Field names count too, as they did when the whole result was matched as one string
+    texts[ANY_FIELD] = "\n".join(map(str, chain.from_iterable(items))).lower()
+    return texts
+
+
+class _MatchColumn:
+    """One field of every search result, joined into a single string searched with str.find()."""
+
+    def __init__(self, texts: list, field: str):
+        column = [text.get(field, "") for text in texts]
+        self.starts = list(accumulate([0] + [len(text) + 1 for text in column[:-1]]))
+        self.text = "\0".join(column)
+
+    def containing(self, keyword: str) -> set:
+        """Positions of the results whose field contains keyword."""
+        if not keyword:
+            return set(range(len(self.starts)))
+        hits = set()
+        pos = self.text.find(keyword)
+        while pos != -1:
+            i = bisect_right(self.starts, pos) - 1
+            hits.add(i)
+            if i + 1 == len(self.starts):
+                break
+            pos = self.text.find(keyword, self.starts[i + 1])
+        return hits
+
+
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
+BOX_INDENT = "|     "
+_BOX_RULE = "+" + "-" * (BOX_WIDTH - 1) + "+"
+_BOX_BLANK = "|" + " " * BOX_WIDTH + "|"
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text: str, prefix: str, width: int) -> tuple:
+    """
+    Greedy word wrap: lines start with prefix and stay within width - 2 characters
+    (a single overlong word gets a line of its own). Cached, since the same style,
+    color and typography rows recur across briefs.
+    """
+    lines = []
+    words = []
+    length = len(prefix)
+    for word in text.split():
+        if words and length + len(word) + 1 > width - 2:
+            lines.append(prefix + " ".join(words))
+            words = []
+            length = len(prefix)
+        length += len(word) + (1 if words else 0)
+        words.append(word)
+    if words:
+        lines.append(prefix + " ".join(words))
+    return tuple(lines)
+
+
+def _box_row(text: str) -> str:
+    """One row of the ASCII box: text padded to the right border."""
+    return text.ljust(BOX_WIDTH) + "|"
+
+
+def write_lines(lines: Iterable[str], out: TextIO) -> None:
+    """Write formatter lines to out as they are produced (same text as "\\n".join(lines))."""
+    first = True
+    for line in lines:
+        if not first:
+            out.write("\n")
+        out.write(line)
+        first = False
+
 
 def format_ascii_box(design_system: dict) -> str:
     """Format design system as ASCII box with emojis (MCP-style)."""
+    return "\n".join(iter_ascii_box(design_system))
+
+
+def format_markdown(design_system: dict) -> str:
+    """Format design system as markdown."""
+    return "\n".join(iter_markdown(design_system))
+
+
+def format_master_md(design_system: dict) -> str:
+    """Format design system as MASTER.md with hierarchical override logic."""
+    return "\n".join(iter_master_md(design_system))
+
+
+def stream_design_system(design_system: dict, out: TextIO, output_format: str = "ascii") -> None:
+    """Write the formatted design system to a file handle (e.g. sys.stdout) without building the whole string."""
+    write_lines(iter_markdown(design_system) if output_format == "markdown" else iter_ascii_box(design_system), out)
+
+
+def iter_ascii_box(design_system: dict) -> Iterator[str]:
+    """Yield the ASCII box (MCP-style) line by line; see format_ascii_box()."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -249,103 +570,82 @@ def format_ascii_box(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
-
     # Build sections from pattern
     sections = pattern.get("sections", "").split(">")
     sections = [s.strip() for s in sections if s.strip()]
 
     # Build output lines
-    lines = []
-    w = BOX_WIDTH - 1
-
-    lines.append("+" + "-" * w + "+")
-    lines.append(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
-    lines.append("+" + "-" * w + "+")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+    yield _BOX_RULE
+    yield _box_row(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM")
+    yield _BOX_RULE
+    yield _BOX_BLANK
 
     # Pattern section
-    lines.append(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box_row(f"|  PATTERN: {pattern.get('name', '')}")
     if pattern.get('conversion'):
-        lines.append(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
+        yield _box_row(f"|     Conversion: {pattern.get('conversion', '')}")
     if pattern.get('cta_placement'):
-        lines.append(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append("|     Sections:".ljust(BOX_WIDTH) + "|")
+        yield _box_row(f"|     CTA: {pattern.get('cta_placement', '')}")
+    yield _box_row("|     Sections:")
     for i, section in enumerate(sections, 1):
-        lines.append(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box_row(f"|       {i}. {section}")
+    yield _BOX_BLANK
 
     # Style section
-    lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box_row(f"|  STYLE: {style.get('name', '')}")
     if style.get("keywords"):
-        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
     if style.get("best_for"):
-        for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        for line in wrap_text(f"Best For: {style.get('best_for', '')}", BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
     if style.get("performance") or style.get("accessibility"):
         perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box_row(f"|     {perf_a11y}")
+    yield _BOX_BLANK
 
     # Colors section
-    lines.append("|  COLORS:".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box_row("|  COLORS:")
+    yield _box_row(f"|     Primary:    {colors.get('primary', '')}")
+    yield _box_row(f"|     Secondary:  {colors.get('secondary', '')}")
+    yield _box_row(f"|     CTA:        {colors.get('cta', '')}")
+    yield _box_row(f"|     Background: {colors.get('background', '')}")
+    yield _box_row(f"|     Text:       {colors.get('text', '')}")
     if colors.get("notes"):
-        for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        for line in wrap_text(f"Notes: {colors.get('notes', '')}", BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
+    yield _BOX_BLANK
 
     # Typography section
-    lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box_row(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}")
     if typography.get("mood"):
-        for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        for line in wrap_text(f"Mood: {typography.get('mood', '')}", BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
     if typography.get("best_for"):
-        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
     if typography.get("google_fonts_url"):
-        lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
+        yield _box_row(f"|     Google Fonts: {typography.get('google_fonts_url', '')}")
     if typography.get("css_import"):
-        lines.append(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box_row(f"|     CSS Import: {typography.get('css_import', '')[:70]}...")
+    yield _BOX_BLANK
 
     # Key Effects section
     if effects:
-        lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(effects, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box_row("|  KEY EFFECTS:")
+        for line in wrap_text(effects, BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
+        yield _BOX_BLANK
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box_row("|  AVOID (Anti-patterns):")
+        for line in wrap_text(anti_patterns, BOX_INDENT, BOX_WIDTH):
+            yield _box_row(line)
+        yield _BOX_BLANK
 
     # Pre-Delivery Checklist section
-    lines.append("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
+    yield _box_row("|  PRE-DELIVERY CHECKLIST:")
     checklist_items = [
         "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
         "[ ] cursor-pointer on all clickable elements",
@@ -356,16 +656,14 @@ def format_ascii_box(design_system: dict) -> str:
         "[ ] Responsive: 375px, 768px, 1024px, 1440px"
     ]
     for item in checklist_items:
-        lines.append(f"|     {item}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    lines.append("+" + "-" * w + "+")
+        yield _box_row(f"|     {item}")
+    yield _BOX_BLANK
 
-    return "\n".join(lines)
+    yield _BOX_RULE
 
 
-def format_markdown(design_system: dict) -> str:
-    """Format design system as markdown."""
+def iter_markdown(design_system: dict) -> Iterator[str]:
+    """Yield the markdown rendering line by line; see format_markdown()."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -373,94 +671,91 @@ def format_markdown(design_system: dict) -> str:
     typography = design_system.get("typography", {})
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
-
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
+    yield f"## Design System: {project}"
+    yield ""
 
     # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
+    yield "### Pattern"
+    yield f"- **Name:** {pattern.get('name', '')}"
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Focus:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
     if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **Color Strategy:** {pattern.get('color_strategy', '')}"
+    yield f"- **Sections:** {pattern.get('sections', '')}"
+    yield ""
 
     # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
+    yield "### Style"
+    yield f"- **Name:** {style.get('name', '')}"
     if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
+        yield f"- **Keywords:** {style.get('keywords', '')}"
     if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
+        yield f"- **Best For:** {style.get('best_for', '')}"
     if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
+        yield f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}"
+    yield ""
 
     # Colors section
-    lines.append("### Colors")
-    lines.append(f"| Role | Hex |")
-    lines.append(f"|------|-----|")
-    lines.append(f"| Primary | {colors.get('primary', '')} |")
-    lines.append(f"| Secondary | {colors.get('secondary', '')} |")
-    lines.append(f"| CTA | {colors.get('cta', '')} |")
-    lines.append(f"| Background | {colors.get('background', '')} |")
-    lines.append(f"| Text | {colors.get('text', '')} |")
+    yield "### Colors"
+    yield f"| Role | Hex |"
+    yield f"|------|-----|"
+    yield f"| Primary | {colors.get('primary', '')} |"
+    yield f"| Secondary | {colors.get('secondary', '')} |"
+    yield f"| CTA | {colors.get('cta', '')} |"
+    yield f"| Background | {colors.get('background', '')} |"
+    yield f"| Text | {colors.get('text', '')} |"
     if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
+        yield f"\n*Notes: {colors.get('notes', '')}*"
+    yield ""
 
     # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
+    yield "### Typography"
+    yield f"- **Heading:** {typography.get('heading', '')}"
+    yield f"- **Body:** {typography.get('body', '')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
+        yield f"- **Best For:** {typography.get('best_for', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
+        yield f"- **Google Fonts:** {typography.get('google_fonts_url', '')}"
     if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
+        yield f"- **CSS Import:**"
+        yield f"```css"
+        yield f"{typography.get('css_import', '')}"
+        yield f"```"
+    yield ""
 
     # Key Effects section
     if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
+        yield "### Key Effects"
+        yield f"{effects}"
+        yield ""
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
+        yield "### Avoid (Anti-patterns)"
         newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
+        yield f"- {anti_patterns.replace(' + ', newline_bullet)}"
+        yield ""
 
     # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
-
-    return "\n".join(lines)
+    yield "### Pre-Delivery Checklist"
+    yield "- [ ] No emojis as icons (use SVG: Heroicons/Lucide)"
+    yield "- [ ] cursor-pointer on all clickable elements"
+    yield "- [ ] Hover states with smooth transitions (150-300ms)"
+    yield "- [ ] Light mode: text contrast 4.5:1 minimum"
+    yield "- [ ] Focus states visible for keyboard nav"
+    yield "- [ ] prefers-reduced-motion respected"
+    yield "- [ ] Responsive: 375px, 768px, 1024px, 1440px"
+    yield ""
 
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           workers: int = 1, pages: list = None, out: TextIO = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,76 +766,250 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        workers: Threads for concurrent domain searches (1 = sequential)
+        pages: Optional list of page names; all overrides are produced in one batched pass
+        out: Optional file handle (e.g. sys.stdout) to stream the output to instead of returning it
 
     Returns:
-        Formatted design system string
+        Formatted design system string ("" when streamed to out)
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    generator = DesignSystemGenerator(workers)
+    try:
+        with PROFILER.stage("generate"):
+            design_system = generator.generate(query, project_name)
+    finally:
+        generator.close()
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, pages)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    with PROFILER.stage("format"):
+        if out is not None:
+            stream_design_system(design_system, out, output_format)
+            return ""
+        if output_format == "markdown":
+            return format_markdown(design_system)
+        return format_ascii_box(design_system)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+# Rendered files carry a generation timestamp; it is ignored when deciding whether content changed
+_GENERATED_LINE = re.compile(r"^(?:> )?\*\*Generated:\*\* .*$", re.MULTILINE)
+
+
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
+
+    Files whose content is unchanged (apart from the Generated timestamp) are left untouched,
+    and design-system/<project>/manifest.json records the query, input fingerprints and
+    output hashes.
     
     Args:
         design_system: The generated design system dictionary
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names, in addition to page; their searches are batched
     
     Returns:
-        dict with created file paths and status
+        dict with file paths (created_files lists every file of this design system,
+        written_files only those whose content changed) and status
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
-    
+    pages = _unique_pages(([page] if page else []) + list(pages or []))
+    design_system_dir, files = _design_system_files(design_system, pages, base_dir, page_query)
+    manifest = _new_manifest(design_system.get("project_name", "default"), page_query, pages, _input_fingerprints())
+    written, unchanged = _write_design_system_files(design_system_dir, files, manifest)
+
+    return {
+        "status": "success",
+        "design_system_dir": str(design_system_dir),
+        "created_files": [str(path) for path in files],
+        "written_files": written,
+        "unchanged_files": unchanged
+    }
+
+
+def _project_slug(project_name: str) -> str:
+    """Folder name for a project under design-system/."""
+    return project_name.lower().replace(' ', '-')
+
+
+def _page_slug(page: str) -> str:
+    """File stem for a page override under pages/."""
+    return page.lower().replace(' ', '-')
+
+
+def _unique_pages(pages: list) -> list:
+    """Drop blank pages and pages that map to the same override file (first one wins)."""
+    seen = set()
+    unique = []
+    for page in pages:
+        page = page.strip()
+        if page and _page_slug(page) not in seen:
+            seen.add(_page_slug(page))
+            unique.append(page)
+    return unique
+
+
+def _design_system_files(design_system: dict, pages: list, base_dir: Path, page_query: str = None) -> tuple:
+    """
+    Render page overrides and defer MASTER.md; returns (project dir, {path: content}) without writing.
+
+    Content is a string, or for MASTER.md a picklable callable returning its lines, so it is
+    streamed straight to disk by _write_design_system_files() instead of held in memory.
+    """
     # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
-    
+    project_slug = _project_slug(design_system.get("project_name", "default"))
+
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
-    
-    created_files = []
-    
-    # Create directories
-    design_system_dir.mkdir(parents=True, exist_ok=True)
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
-    
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
-    
+
+    files = {design_system_dir / "MASTER.md": partial(iter_master_md, design_system)}
+    # Page override files get intelligent, search-backed content; all pages' searches run as one batch
+    with PROFILER.stage("pages.render"):
+        for page, searches in zip(pages, _page_override_searches(pages, page_query)):
+            page_file = pages_dir / f"{_page_slug(page)}.md"
+            files[page_file] = format_page_override_md(design_system, page, page_query, searches)
+    return design_system_dir, files
+
+
+def _content_hash(content: str) -> str:
+    """Hash of rendered output, ignoring its Generated timestamp."""
+    return _sha1(_GENERATED_LINE.sub("", content).encode("utf-8"))
+
+
+def _file_hash(path: Path):
+    """_content_hash() of a file on disk, or None if it can't be read."""
+    try:
+        return _content_hash(path.read_text(encoding='utf-8'))
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _input_fingerprints() -> dict:
+    """Content hashes of everything a design system is generated from: data files and generator code."""
+    sources = [DATA_DIR / CSV_CONFIG[domain]["file"] for domain in list(SEARCH_CONFIG) + ["ux"]]
+    sources += [DATA_DIR / REASONING_FILE, Path(__file__), Path(core.__file__)]
+    return {path.name: _fingerprint(path)["sha1"] if path.exists() else None for path in sources}
+
+
+def _new_manifest(project_name: str, query: str, pages: list, inputs: dict) -> dict:
+    """Manifest for one persist; output hashes are filled in as files are written."""
     return {
-        "status": "success",
-        "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "version": MANIFEST_VERSION,
+        "project_name": project_name,
+        "query": query,
+        "inputs": inputs,
+        "pages": {_page_slug(page): query for page in pages},
+        "files": {}
     }
 
 
-def format_master_md(design_system: dict) -> str:
-    """Format design system as MASTER.md with hierarchical override logic."""
+def _read_manifest(design_system_dir: Path) -> dict:
+    """Stored manifest of a project folder, or {} when missing or from another version."""
+    try:
+        with open(design_system_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def _manifest_is_current(design_system_dir: Path, project_name: str, query: str, pages: list, inputs: dict) -> bool:
+    """True when persisting this brief again would reproduce exactly what is on disk."""
+    manifest = _read_manifest(design_system_dir)
+    if not manifest or manifest.get("project_name") != project_name or manifest.get("query") != query \
+            or manifest.get("inputs") != inputs:
+        return False
+    if any(manifest["pages"].get(_page_slug(page)) != query for page in pages):
+        return False
+    expected = ["MASTER.md"] + [f"pages/{_page_slug(page)}.md" for page in pages]
+    return all(name in manifest["files"] and _file_hash(design_system_dir / name) == manifest["files"][name]
+               for name in expected)
+
+
+def _write_design_system_files(design_system_dir: Path, files: dict, manifest: dict = None) -> tuple:
+    """
+    Write rendered files whose content changed, atomically; update the manifest if given.
+
+    Returns:
+        (written paths, unchanged paths)
+    """
+    (design_system_dir / "pages").mkdir(parents=True, exist_ok=True)
+    written, unchanged = [], []
+    hashes = {}
+    for path, content in files.items():
+        # MASTER.md is formatted while it streams to disk, so its formatting is timed here too
+        with PROFILER.stage("persist.write"):
+            previous = _file_hash(path)
+            if isinstance(content, str):
+                digest = _content_hash(content)
+                changed = digest != previous
+                if changed:
+                    _write_atomic(path, content)
+            else:
+                digest, changed = _stream_atomic(path, content(), previous)
+        (written if changed else unchanged).append(str(path))
+        hashes[path.relative_to(design_system_dir).as_posix()] = digest
+
+    if manifest is not None:
+        _write_manifest(design_system_dir, manifest, hashes)
+    return written, unchanged
+
+
+def _stream_atomic(path: Path, lines: Iterable[str], previous: str = None) -> tuple:
+    """
+    Stream lines to a temp file while hashing them like _content_hash(); the file replaces
+    path only when the hash differs from previous.
+
+    Returns:
+        (content hash, whether path was replaced)
+    """
+    hasher = hashlib.sha1()
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for n, line in enumerate(lines):
+                if n:
+                    f.write("\n")
+                    hasher.update(b"\n")
+                f.write(line)
+                hasher.update(_GENERATED_LINE.sub("", line).encode("utf-8"))
+        digest = hasher.hexdigest()
+        if digest == previous:
+            return digest, False
+        os.replace(tmp, path)
+        return digest, True
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _write_manifest(design_system_dir: Path, manifest: dict, hashes: dict):
+    """Record output hashes, keeping earlier pages of the same brief; skip the write if nothing changed."""
+    previous = _read_manifest(design_system_dir)
+    manifest = dict(manifest, pages=dict(manifest["pages"]), files=dict(hashes))
+    if previous.get("query") == manifest["query"] and previous.get("inputs") == manifest["inputs"] \
+            and previous.get("project_name") == manifest["project_name"]:
+        # Same brief and inputs: overrides written by earlier runs are still valid
+        manifest["pages"] = dict(previous.get("pages", {}), **manifest["pages"])
+        manifest["files"] = dict(previous.get("files", {}), **manifest["files"])
+
+    stable = {key: value for key, value in previous.items() if key != "generated"}
+    if stable == manifest:
+        return
+    manifest["generated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    _write_atomic(design_system_dir / MANIFEST_FILE, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+
+
+def iter_master_md(design_system: dict) -> Iterator[str]:
+    """Yield MASTER.md line by line; see format_master_md()."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
@@ -551,265 +1020,262 @@ def format_master_md(design_system: dict) -> str:
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    lines = []
-    
     # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    yield "# Design System Master File"
+    yield ""
+    yield "> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`."
+    yield "> If that file exists, its rules **override** this Master file."
+    yield "> If not, strictly follow the rules below."
+    yield ""
+    yield "---"
+    yield ""
+    yield f"**Project:** {project}"
+    yield f"**Generated:** {timestamp}"
+    yield f"**Category:** {design_system.get('category', 'General')}"
+    yield ""
+    yield "---"
+    yield ""
     
     # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
+    yield "## Global Rules"
+    yield ""
     
     # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
+    yield "### Color Palette"
+    yield ""
+    yield "| Role | Hex | CSS Variable |"
+    yield "|------|-----|--------------|"
+    yield f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |"
+    yield f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |"
+    yield f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |"
+    yield f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |"
+    yield f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |"
+    yield ""
     if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
+        yield f"**Color Notes:** {colors.get('notes', '')}"
+        yield ""
     
     # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
+    yield "### Typography"
+    yield ""
+    yield f"- **Heading Font:** {typography.get('heading', 'Inter')}"
+    yield f"- **Body Font:** {typography.get('body', 'Inter')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
+        yield f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})"
+    yield ""
     if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
+        yield "**CSS Import:**"
+        yield "```css"
+        yield typography.get("css_import", "")
+        yield "```"
+        yield ""
     
     # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
+    yield "### Spacing Variables"
+    yield ""
+    yield "| Token | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--space-xs` | `4px` / `0.25rem` | Tight gaps |"
+    yield "| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |"
+    yield "| `--space-md` | `16px` / `1rem` | Standard padding |"
+    yield "| `--space-lg` | `24px` / `1.5rem` | Section padding |"
+    yield "| `--space-xl` | `32px` / `2rem` | Large gaps |"
+    yield "| `--space-2xl` | `48px` / `3rem` | Section margins |"
+    yield "| `--space-3xl` | `64px` / `4rem` | Hero padding |"
+    yield ""
     
     # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
+    yield "### Shadow Depths"
+    yield ""
+    yield "| Level | Value | Usage |"
+    yield "|-------|-------|-------|"
+    yield "| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |"
+    yield "| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |"
+    yield "| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |"
+    yield "| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |"
+    yield ""
     
     # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Component Specs"
+    yield ""
     
     # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Buttons"
+    yield ""
+    yield "```css"
+    yield "/* Primary Button */"
+    yield ".btn-primary {"
+    yield f"  background: {colors.get('cta', '#F97316')};"
+    yield "  color: white;"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".btn-primary:hover {"
+    yield "  opacity: 0.9;"
+    yield "  transform: translateY(-1px);"
+    yield "}"
+    yield ""
+    yield "/* Secondary Button */"
+    yield ".btn-secondary {"
+    yield f"  background: transparent;"
+    yield f"  color: {colors.get('primary', '#2563EB')};"
+    yield f"  border: 2px solid {colors.get('primary', '#2563EB')};"
+    yield "  padding: 12px 24px;"
+    yield "  border-radius: 8px;"
+    yield "  font-weight: 600;"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Cards"
+    yield ""
+    yield "```css"
+    yield ".card {"
+    yield f"  background: {colors.get('background', '#FFFFFF')};"
+    yield "  border-radius: 12px;"
+    yield "  padding: 24px;"
+    yield "  box-shadow: var(--shadow-md);"
+    yield "  transition: all 200ms ease;"
+    yield "  cursor: pointer;"
+    yield "}"
+    yield ""
+    yield ".card:hover {"
+    yield "  box-shadow: var(--shadow-lg);"
+    yield "  transform: translateY(-2px);"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Inputs"
+    yield ""
+    yield "```css"
+    yield ".input {"
+    yield "  padding: 12px 16px;"
+    yield "  border: 1px solid #E2E8F0;"
+    yield "  border-radius: 8px;"
+    yield "  font-size: 16px;"
+    yield "  transition: border-color 200ms ease;"
+    yield "}"
+    yield ""
+    yield ".input:focus {"
+    yield f"  border-color: {colors.get('primary', '#2563EB')};"
+    yield "  outline: none;"
+    yield f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
+    yield "### Modals"
+    yield ""
+    yield "```css"
+    yield ".modal-overlay {"
+    yield "  background: rgba(0, 0, 0, 0.5);"
+    yield "  backdrop-filter: blur(4px);"
+    yield "}"
+    yield ""
+    yield ".modal {"
+    yield "  background: white;"
+    yield "  border-radius: 16px;"
+    yield "  padding: 32px;"
+    yield "  box-shadow: var(--shadow-xl);"
+    yield "  max-width: 500px;"
+    yield "  width: 90%;"
+    yield "}"
+    yield "```"
+    yield ""
     
     # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Style Guidelines"
+    yield ""
+    yield f"**Style:** {style.get('name', 'Minimalism')}"
+    yield ""
     if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
+        yield f"**Keywords:** {style.get('keywords', '')}"
+        yield ""
     if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
+        yield f"**Best For:** {style.get('best_for', '')}"
+        yield ""
     if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
+        yield f"**Key Effects:** {effects}"
+        yield ""
     
     # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
+    yield "### Page Pattern"
+    yield ""
+    yield f"**Pattern Name:** {pattern.get('name', '')}"
+    yield ""
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Strategy:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
+    yield f"- **Section Order:** {pattern.get('sections', '')}"
+    yield ""
     
     # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
+    yield "---"
+    yield ""
+    yield "## Anti-Patterns (Do NOT Use)"
+    yield ""
     if anti_patterns:
         anti_list = [a.strip() for a in anti_patterns.split("+")]
         for anti in anti_list:
             if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
+                yield f"- ❌ {anti}"
+    yield ""
+    yield "### Additional Forbidden Patterns"
+    yield ""
+    yield "- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)"
+    yield "- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer"
+    yield "- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout"
+    yield "- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio"
+    yield "- ❌ **Instant state changes** — Always use transitions (150-300ms)"
+    yield "- ❌ **Invisible focus states** — Focus states must be visible for a11y"
+    yield ""
     
     # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
-
-
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+    yield "---"
+    yield ""
+    yield "## Pre-Delivery Checklist"
+    yield ""
+    yield "Before delivering any UI code, verify:"
+    yield ""
+    yield "- [ ] No emojis used as icons (use SVG instead)"
+    yield "- [ ] All icons from consistent icon set (Heroicons/Lucide)"
+    yield "- [ ] `cursor-pointer` on all clickable elements"
+    yield "- [ ] Hover states with smooth transitions (150-300ms)"
+    yield "- [ ] Light mode: text contrast 4.5:1 minimum"
+    yield "- [ ] Focus states visible for keyboard navigation"
+    yield "- [ ] `prefers-reduced-motion` respected"
+    yield "- [ ] Responsive: 375px, 768px, 1024px, 1440px"
+    yield "- [ ] No content hidden behind fixed navbars"
+    yield "- [ ] No horizontal scroll on mobile"
+    yield ""
+
+
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            searches: dict = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system, searches)
     
     lines = []
     
@@ -911,23 +1377,39 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     return "\n".join(lines)
 
 
-def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
+def _page_context(page_name: str, page_query: str = None) -> str:
+    """Search context for a page: its name plus the brief's query."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
+
+
+def _page_override_searches(pages: list, page_query: str = None) -> list:
+    """Style, UX and landing searches for many pages, batched per domain (repeated contexts run once)."""
+    if not pages:
+        return []
+    contexts = [_page_context(page, page_query) for page in pages]
+    style = search_batch(contexts, "style", 1)
+    ux = search_batch(contexts, "ux", 3)
+    landing = search_batch(contexts, "landing", 1)
+    return [{"style": s, "ux": u, "landing": l} for s, u, l in zip(style, ux, landing)]
+
+
+def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict,
+                                    searches: dict = None) -> dict:
     """
     Generate intelligent overrides based on page type using layered search.
     
     Uses the existing search infrastructure to find relevant style, UX, and layout
-    data instead of hardcoded page types.
+    data instead of hardcoded page types. searches holds this page's results from
+    _page_override_searches() when they were run as a batch.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
+    combined_context = _page_context(page_name, page_query)
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    if searches is None:
+        searches = _page_override_searches([page_name], page_query)[0]
+    style_search = searches["style"]
+    ux_search = searches["ux"]
+    landing_search = searches["landing"]
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -1052,6 +1534,228 @@ def _detect_page_type(context: str, style_results: list) -> str:
     return "General"
 
 
+# ============ BULK GENERATION ============
+_BULK_GENERATOR = None
+
+
+def load_briefs(path: str) -> list:
+    """
+    Read briefs from a .csv (columns: query, project_name, pages) or .jsonl file.
+
+    pages is a comma-separated string in CSV and a list or comma-separated string in JSONL.
+    """
+    if str(path).lower().endswith(".csv"):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    briefs = []
+    for number, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            raise ValueError(f"{path}: brief {number} is not an object")
+        query = record.get("query") or ""
+        if not isinstance(query, str):
+            raise ValueError(f"{path}: brief {number} query must be a string")
+        query = query.strip()
+        if not query:
+            raise ValueError(f"{path}: brief {number} has no query")
+        project_name = record.get("project_name") or ""
+        if not isinstance(project_name, str):
+            raise ValueError(f"{path}: brief {number} project_name must be a string")
+        pages = record.get("pages") or []
+        if isinstance(pages, str):
+            pages = pages.split(",")
+        if not isinstance(pages, list) or not all(isinstance(page, str) for page in pages):
+            raise ValueError(f"{path}: brief {number} pages must be a string or a list of strings")
+        briefs.append({
+            "query": query,
+            "project_name": project_name.strip() or None,
+            "pages": _unique_pages(pages)
+        })
+    return briefs
+
+
+def _render_brief(generator: DesignSystemGenerator, brief: dict, base_dir: Path, inputs: dict, force: bool = False) -> dict:
+    """Generate one brief and render its files (no writes, so briefs can run concurrently)."""
+    project_name = brief["project_name"] or brief["query"].upper()
+    design_system_dir = base_dir / "design-system" / _project_slug(project_name)
+    with PROFILER.stage("manifest.check"):
+        current = not force and _manifest_is_current(design_system_dir, project_name, brief["query"], brief["pages"], inputs)
+    if current:
+        return {"query": brief["query"], "project_name": project_name, "design_system_dir": design_system_dir,
+                "skipped": True}
+
+    started = time.perf_counter()
+    try:
+        with PROFILER.stage("generate"):
+            design_system = generator.generate(brief["query"], brief["project_name"])
+        generated = time.perf_counter()
+        design_system_dir, files = _design_system_files(design_system, brief["pages"], base_dir, brief["query"])
+    except Exception as e:
+        return {"query": brief["query"], "project_name": project_name, "error": str(e)}
+    rendered = time.perf_counter()
+    return {
+        "query": brief["query"],
+        "project_name": design_system["project_name"],
+        "design_system_dir": design_system_dir,
+        "files": files,
+        "manifest": _new_manifest(design_system["project_name"], brief["query"], brief["pages"], inputs),
+        "generate_ms": (generated - started) * 1000,
+        "render_ms": (rendered - generated) * 1000
+    }
+
+
+def _init_bulk_process(profile: bool = False):
+    """Process-pool initializer: one generator (reasoning table + warm indexes) per worker."""
+    global _BULK_GENERATOR
+    PROFILER.enabled = profile
+    _BULK_GENERATOR = DesignSystemGenerator()
+
+
+def _render_brief_in_process(brief: dict, base_dir: Path, inputs: dict, force: bool) -> dict:
+    """_render_brief() with this worker process's generator; hands back its stage timings too."""
+    result = _render_brief(_BULK_GENERATOR, brief, base_dir, inputs, force)
+    if PROFILER.enabled:
+        result["profile"] = PROFILER.take()
+    return result
+
+
+def _ordered_map(pool, fn, items, window: int) -> Iterator:
+    """pool.map() in input order with at most window calls in flight, so finished results don't pile up."""
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _persist_rendered(item: dict) -> dict:
+    """Write one _render_brief() result's files and manifest; returns its per-brief summary."""
+    if "error" in item:
+        return item
+    if item.get("skipped"):
+        return {
+            "query": item["query"],
+            "project_name": item["project_name"],
+            "design_system_dir": str(item["design_system_dir"]),
+            "skipped": True,
+            "written_files": []
+        }
+    written, unchanged = _write_design_system_files(item["design_system_dir"], item["files"], item["manifest"])
+    return {
+        "query": item["query"],
+        "project_name": item["project_name"],
+        "design_system_dir": str(item["design_system_dir"]),
+        "created_files": [str(path) for path in item["files"]],
+        "written_files": written,
+        "unchanged_files": unchanged,
+        "generate_ms": round(item["generate_ms"], 2),
+        "render_ms": round(item["render_ms"], 2)
+    }
+
+
+def generate_bulk(briefs: list, output_dir: str = None, workers: int = 4, processes: bool = False,
+                  force: bool = False) -> dict:
+    """
+    Generate and persist design systems for many briefs in one run.
+
+    Briefs run on a pool of worker threads sharing one generator, reasoning table and
+    warm index (or, with processes=True, worker processes with one generator each).
+    Each brief's files are written as soon as it and every earlier brief are done, in
+    brief order, so a later brief with the same project name wins exactly as it would in
+    a sequential run. At most 2 x workers briefs are in flight and only the per-brief
+    summaries are kept, so memory doesn't grow with the number of briefs. Briefs whose
+    manifest shows the same query, pages, inputs and outputs are skipped unless force is set.
+
+    Returns:
+        dict with per-brief results (in input order) and a timings summary
+    """
+    base_dir = Path(output_dir) if output_dir else Path.cwd()
+    workers = max(1, workers)
+    started = time.perf_counter()
+    inputs = _input_fingerprints()
+
+    pool = None
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_bulk_process, initargs=(PROFILER.enabled,))
+        render = partial(_render_brief_in_process, base_dir=base_dir, inputs=inputs, force=force)
+    else:
+        generator = DesignSystemGenerator()
+        render = partial(_render_brief, generator, base_dir=base_dir, inputs=inputs, force=force)
+        if workers > 1:
+            get_domain_index()  # Load once before the threads share it
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="design-bulk")
+
+    results = []
+    written_dirs = set()
+    write_s = 0.0
+    try:
+        rendered = map(render, briefs) if pool is None else _ordered_map(pool, render, briefs, workers * 2)
+        for brief, item in zip(briefs, rendered):
+            if item.get("skipped") and item["design_system_dir"] in written_dirs:
+                # Checked against the manifest before an earlier brief rewrote the same project
+                item = render(brief) if pool is None else pool.submit(render, brief).result()
+            PROFILER.merge(item.pop("profile", {}))
+            if "error" not in item and not item.get("skipped"):
+                written_dirs.add(item["design_system_dir"])
+            write_started = time.perf_counter()
+            try:
+                results.append(_persist_rendered(item))
+            except Exception as e:
+                # One unwritable project must not cost the rest of the run
+                results.append({"query": item["query"], "project_name": item["project_name"], "error": str(e)})
+            write_s += time.perf_counter() - write_started
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    finished = time.perf_counter()
+
+    done = [r for r in results if "error" not in r and not r.get("skipped")]
+    generate_times = sorted(r["generate_ms"] for r in done)
+    return {
+        "results": results,
+        "timings": {
+            "briefs": len(briefs),
+            "failed": sum(1 for r in results if "error" in r),
+            "skipped": sum(1 for r in results if r.get("skipped")),
+            "files_written": sum(len(r["written_files"]) for r in done),
+            "files_unchanged": sum(len(r["unchanged_files"]) for r in done),
+            "workers": workers,
+            "mode": "process" if processes else "thread",
+            "total_s": round(finished - started, 3),
+            "generate_s": round(finished - started - write_s, 3),
+            "write_s": round(write_s, 3),
+            "briefs_per_s": round(len(briefs) / (finished - started), 1) if finished > started else None,
+            "generate_ms_p50": generate_times[len(generate_times) // 2] if generate_times else None,
+            "generate_ms_max": generate_times[-1] if generate_times else None
+        }
+    }
+
+
+def format_bulk_summary(report: dict) -> str:
+    """Human-readable summary of a generate_bulk() report."""
+    t = report["timings"]
+    lines = [f"Generated {t['briefs'] - t['failed'] - t['skipped']}/{t['briefs']} design systems "
+             f"({t['skipped']} up to date, {t['files_written']} files written, {t['files_unchanged']} unchanged) "
+             f"in {t['total_s']}s with {t['workers']} {t['mode']} worker(s)"]
+    lines.append(f"  generate + render: {t['generate_s']}s | write: {t['write_s']}s | {t['briefs_per_s']} briefs/s")
+    if t["generate_ms_p50"] is not None:
+        lines.append(f"  per brief generate: p50 {t['generate_ms_p50']}ms, max {t['generate_ms_max']}ms")
+    for result in report["results"]:
+        if "error" in result:
+            lines.append(f"  ✗ {result['project_name']} ({result['query']}): {result['error']}")
+        elif result.get("skipped"):
+            lines.append(f"  = {result['design_system_dir']} (up to date)")
+        else:
+            lines.append(f"  ✓ {result['design_system_dir']} ({len(result['written_files'])}/{len(result['created_files'])} files written)")
+    return "\n".join(lines)
+
+
 # ============ CLI SUPPORT ============
 if __name__ == "__main__":
     import argparse
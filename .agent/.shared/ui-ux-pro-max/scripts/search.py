@@ -5,6 +5,10 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages dashboard,checkout,settings
+       python search.py --serve [--port 8765]
+       python search.py --batch < queries.jsonl
+       python search.py --bulk briefs.csv [--workers 4] [-o out/]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +16,38 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages; all overrides are generated in one pass with batched searches
+
+Bulk design systems:
+  --bulk       Generate and persist a design system for every brief in a CSV (query, project_name,
+               pages) or JSONL file, sharing one generator; prints a timing summary
+  --workers    Worker threads for --bulk (default: 4); --processes uses worker processes instead
+  --force      Regenerate briefs whose design-system/<project>/manifest.json is already up to date
+
+Profiling:
+  --profile      Record wall time and call counts per stage (index load/build, BM25 fit, scoring,
+                 reasoning lookup, best-match selection, formatting, writes) and emit them as JSON:
+                 design-system/<project>/profile.json with --persist, design-system/profile.json
+                 with --bulk, otherwise stderr. UIPRO_PROFILE=1 does the same.
+  --profile-out  Write the profile JSON to this file instead
+
+Batch:
+  --batch      Read one JSON query per line from stdin ({"query", "domain" | "stack", "max_results"})
+               and stream one JSON result per line; indexes are loaded once for the whole batch
+
+Daemon (warm indexes, see server.py):
+  --serve      Keep all indexes in memory and answer queries on localhost
+  Other invocations forward to a running daemon and fall back to in-process search.
+  --no-daemon  Always search in-process
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import sys
+from pathlib import Path
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, PROFILER, search, search_stack
+# design_system and the daemon modules are imported only on the paths that use them,
+# so a plain domain/stack search starts with just the engine loaded
 
 
 def format_output(result):
@@ -45,9 +76,78 @@ def format_output(result):
     return "\n".join(output)
 
 
+def validate_query(payload):
+    """Raise ValueError unless payload is a well-formed query object"""
+    if not isinstance(payload, dict):
+        raise ValueError("Query must be a JSON object")
+    query = payload.get("query")
+    if query is None or query == "":
+        raise ValueError("Missing 'query'")
+    if not isinstance(query, str):
+        raise ValueError("'query' must be a string")
+    max_results = payload.get("max_results", MAX_RESULTS)
+    if isinstance(max_results, bool) or not isinstance(max_results, int) or max_results < 1:
+        raise ValueError("'max_results' must be a positive integer")
+    for field in ("domain", "stack", "project_name", "format"):
+        if payload.get(field) is not None and not isinstance(payload[field], str):
+            raise ValueError(f"'{field}' must be a string")
+    if payload.get("domain") is not None and payload["domain"] not in CSV_CONFIG:
+        raise ValueError(f"Unknown domain: {payload['domain']}. Available: {', '.join(CSV_CONFIG)}")
+    if payload.get("stack") is not None and payload["stack"] not in AVAILABLE_STACKS:
+        raise ValueError(f"Unknown stack: {payload['stack']}. Available: {', '.join(AVAILABLE_STACKS)}")
+
+
+def run_query(payload):
+    """Answer one JSON-style query payload (shared by --batch and the daemon); ValueError if malformed"""
+    validate_query(payload)
+    query = payload["query"]
+    max_results = payload.get("max_results", MAX_RESULTS)
+
+    if payload.get("design_system"):
+        from design_system import generate_design_system
+        return {"output": generate_design_system(query, payload.get("project_name"), payload.get("format", "ascii"))}
+    if payload.get("stack"):
+        return search_stack(query, payload["stack"], max_results)
+    return search(query, payload.get("domain"), max_results)
+
+
+def write_profile(args, default_path=None):
+    """Emit PROFILER's report to --profile-out, default_path (next to the output) or stderr"""
+    path = args.profile_out or default_path
+    extra = {"argv": sys.argv[1:]}
+    if path:
+        print(f"Profile written to {PROFILER.write(path, **extra)}", file=sys.stderr)
+    else:
+        print(json.dumps(PROFILER.report(**extra), indent=2, ensure_ascii=False), file=sys.stderr)
+
+
+def run_batch(lines, out):
+    """Answer JSONL queries, writing one JSON result line per input line as it completes"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as e:
+            result = {"error": f"Invalid JSON: {e}"}
+        else:
+            # A bad line gets an error line; the rest of the batch still runs
+            try:
+                result = run_query(payload)
+            except ValueError as e:
+                result = {"error": str(e)}
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            if isinstance(payload, dict) and "id" in payload:
+                result["id"] = payload["id"]
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
@@ -59,19 +159,82 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated pages to create override files for in one pass")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Bulk design systems
+    parser.add_argument("--bulk", type=str, default=None, help="CSV/JSONL of briefs (query, project_name, pages) to generate and persist")
+    parser.add_argument("--workers", type=int, default=4, help="Worker pool size for --bulk (default: 4)")
+    parser.add_argument("--processes", action="store_true", help="Use worker processes instead of threads for --bulk")
+    parser.add_argument("--force", action="store_true", help="With --bulk, regenerate briefs even if their manifest is up to date")
+    # Batch / daemon
+    parser.add_argument("--batch", action="store_true", help="Read JSONL queries from stdin and stream JSON results")
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon with all indexes kept warm")
+    parser.add_argument("--port", type=int, default=None, help="Daemon port (default: $UIPRO_SEARCH_PORT or 8765)")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if a daemon is running")
+    # Profiling
+    parser.add_argument("--profile", action="store_true", help="Record per-stage timings and call counts as JSON")
+    parser.add_argument("--profile-out", type=str, default=None, help="File for the --profile JSON (default: next to the output, or stderr)")
 
     args = parser.parse_args()
+    # Profiling needs the work to happen in this process, so it also skips the daemon
+    profiling = args.profile or bool(args.profile_out) or PROFILER.enabled
+    if profiling:
+        PROFILER.enabled = True
+        PROFILER.reset()
 
+    if args.serve:
+        from server import serve, DEFAULT_HOST, DEFAULT_PORT
+        serve(DEFAULT_HOST, args.port or DEFAULT_PORT)
+        raise SystemExit(0)
+    if args.batch:
+        run_batch(sys.stdin, sys.stdout)
+        if profiling:
+            write_profile(args)
+        raise SystemExit(0)
+    if args.bulk:
+        from design_system import load_briefs, generate_bulk, format_bulk_summary
+        report = generate_bulk(load_briefs(args.bulk), args.output_dir, args.workers, args.processes, args.force)
+        print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_bulk_summary(report))
+        if profiling:
+            write_profile(args, Path(args.output_dir or ".") / "design-system" / "profile.json")
+        raise SystemExit(1 if report["timings"]["failed"] else 0)
+    if not args.query:
+        parser.error("the following arguments are required: query")
+
+    # Forward to a running daemon unless files must be written locally
+    forwarded = None
+    if not args.no_daemon and not args.persist and not profiling:
+        from client import request, DEFAULT_HOST, DEFAULT_PORT, FORWARD_TIMEOUT
+        forwarded = request({
+            "query": args.query,
+            "domain": args.domain,
+            "stack": args.stack,
+            "max_results": args.max_results,
+            "design_system": args.design_system,
+            "project_name": args.project_name,
+            "format": args.format
+        }, DEFAULT_HOST, args.port or DEFAULT_PORT, timeout=FORWARD_TIMEOUT)
+
+    if forwarded is not None:
+        if args.design_system:
+            print(forwarded.get("output", f"Error: {forwarded.get('error')}"))
+        elif args.json:
+            print(json.dumps(forwarded, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(forwarded))
     # Design system takes priority
-    if args.design_system:
+    elif args.design_system:
+        from design_system import generate_design_system
+        pages = [p.strip() for p in args.pages.split(",") if p.strip()] if args.pages else []
         result = generate_design_system(
             args.query, 
             args.project_name, 
             args.format,
             persist=args.persist,
             page=args.page,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            pages=pages,
+            out=sys.stdout
         )
         print(result)
         
@@ -81,8 +244,7 @@ if __name__ == "__main__":
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
+            for page_filename in dict.fromkeys(p.lower().replace(' ', '-') for p in ([args.page] if args.page else []) + pages):
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
@@ -92,7 +254,6 @@ if __name__ == "__main__":
     elif args.stack:
         result = search_stack(args.query, args.stack, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -100,7 +261,14 @@ if __name__ == "__main__":
     else:
         result = search(args.query, args.domain, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
+
+    if profiling:
+        profile_path = None
+        if args.design_system and args.persist:
+            from design_system import _project_slug
+            project_dir = Path(args.output_dir or ".") / "design-system" / _project_slug(args.project_name or args.query.upper())
+            profile_path = project_dir / "profile.json"
+        write_profile(args, profile_path)
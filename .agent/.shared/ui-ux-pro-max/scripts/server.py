@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - keeps every BM25 index warm and answers
+JSON queries over localhost HTTP.
+
+Usage:
+    python search.py --serve [--port 8765]
+
+Clients: search.py forwards queries here via client.request().
+
+Protocol:
+    GET  /health  -> {"status": "ok", "indexes": <count>}
+    POST /search  <- {"query": "...", "domain": "style" | null, "stack": null, "max_results": 3}
+                  -> same dict as core.search() / core.search_stack()
+    POST /search  <- {"query": "...", "design_system": true, "project_name": null, "format": "ascii"}
+                  -> {"output": "<formatted design system>"}
+    Errors         -> {"error": "..."} with 400 for a malformed request, 500 if the query failed
+"""
+
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from client import DEFAULT_HOST, DEFAULT_PORT, request
+from core import warm_indexes
+from search import run_query
+
+
+# ============ SERVER ============
+class SearchHandler(BaseHTTPRequestHandler):
+    """HTTP front-end for search.run_query()."""
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "indexes": self.server.index_count})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/search":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        try:
+            result = run_query(payload)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        pass  # Keep the daemon quiet; agents read stdout of the client, not the server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Warm all indexes and serve queries until interrupted."""
+    server = ThreadingHTTPServer((host, port), SearchHandler)
+    server.daemon_threads = True
+    server.index_count = warm_indexes()
+    print(f"UI Pro Max search daemon on http://{host}:{port} ({server.index_count} indexes warm)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="UI Pro Max search daemon")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    args = parser.parse_args()
+    serve(args.host, args.port)
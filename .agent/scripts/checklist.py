@@ -90,6 +90,8 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     cmd = [sys.executable, str(script_path), project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
         cmd.append(url)
+    if script_path.name == "security_scan.py":
+        cmd.extend(["--jobs", "0"])  # one scan process per CPU
     
     # Run script
     try:
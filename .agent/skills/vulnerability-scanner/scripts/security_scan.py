@@ -3,7 +3,8 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--jobs N] [--no-cache]
+       python security_scan.py <project_path> --since <git-ref> | --staged
 Output: JSON with validation findings
 
 This script verifies:
@@ -13,13 +14,18 @@ This script verifies:
 4. Configuration - Security settings validated (OWASP A02)
 """
 import subprocess
+import hashlib
 import json
 import os
 import sys
 import re
+import threading
 import argparse
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterator, List, Optional, Set
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -85,9 +91,72 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+CONFIG_PATTERNS = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILENAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+FILE_SCAN_TYPES = ("secrets", "patterns", "config")
+
+# Per-file findings are cached here between runs (see FindingsCache); CACHE_VERSION is the
+# cache file format, rule and matching changes are picked up by RULES_VERSION
+CACHE_DIR = Path(__file__).resolve().parents[3] / ".cache"
+CACHE_VERSION = 1
+
+# With --since/--staged the dependency scan only runs when one of these changed
+DEPENDENCY_FILES = {'package.json', 'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml',
+                    'requirements.txt', 'Pipfile.lock', 'poetry.lock', 'setup.py'}
+
+# Literals at least one of which every match of the pattern must contain (compared against
+# case-folded text). A file or line without any of them can't match, so the regex is never
+# run there. Patterns without an entry are always run.
+SQL_KEYWORDS = ("select", "insert", "update", "delete")
+PATTERN_ANCHORS = {
+    # SECRET_PATTERNS
+    r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']': ("api",),
+    r'token\s*[=:]\s*["\'][^"\']{10,}["\']': ("token",),
+    r'bearer\s+[a-zA-Z0-9\-_.]+': ("bearer",),
+    r'AKIA[0-9A-Z]{16}': ("akia",),
+    r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']': ("aws",),
+    r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']': ("azure",),
+    r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']': ("google",),
+    r'password\s*[=:]\s*["\'][^"\']{4,}["\']': ("password",),
+    r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+': ("://",),
+    r'-----BEGIN\s+(RSA|PRIVATE|EC)\s+KEY-----': ("-----begin",),
+    r'ssh-rsa\s+[A-Za-z0-9+/]+': ("ssh-rsa",),
+    r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+': ("eyj",),
+    # DANGEROUS_PATTERNS
+    r'eval\s*\(': ("eval",),
+    r'exec\s*\(': ("exec",),
+    r'new\s+Function\s*\(': ("function",),
+    r'child_process\.exec\s*\(': ("child_process.exec",),
+    r'subprocess\.call\s*\([^)]*shell\s*=\s*True': ("subprocess.call",),
+    r'dangerouslySetInnerHTML': ("dangerouslysetinnerhtml",),
+    r'\.innerHTML\s*=': (".innerhtml",),
+    r'document\.write\s*\(': ("document.write",),
+    r'["\'][^"\']*\+\s*[a-zA-Z_]+\s*\+\s*["\'].*(?:SELECT|INSERT|UPDATE|DELETE)': SQL_KEYWORDS,
+    r'f"[^"]*(?:SELECT|INSERT|UPDATE|DELETE)[^"]*\{': SQL_KEYWORDS,
+    r'verify\s*=\s*False': ("verify",),
+    r'--insecure': ("--insecure",),
+    r'disable[_-]?ssl': ("disable",),
+    r'pickle\.loads?\s*\(': ("pickle.load",),
+    r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)': ("yaml.load",),
+    # CONFIG_PATTERNS
+    r'"DEBUG"\s*:\s*true': ('"debug"',),
+    r'debug\s*=\s*True': ("debug",),
+    r'NODE_ENV.*development': ("node_env",),
+    r'"CORS_ALLOW_ALL".*true': ('"cors_allow_all"',),
+    r'"Access-Control-Allow-Origin".*\*': ('"access-control-allow-origin"',),
+    r'allowCredentials.*true.*origin.*\*': ("allowcredentials",),
+}
 
 
 # ============================================================================
@@ -183,43 +252,338 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
     """
-    results = {
-        "tool": "secret_scanner",
-        "findings": [],
-        "status": "[OK] No secrets detected",
-        "scanned_files": 0,
-        "by_severity": {"critical": 0, "high": 0, "medium": 0}
-    }
-    
+    return scan_files(project_path, ["secrets"])["secrets"]
+
+
+def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+    """
+    Validate dangerous code patterns (OWASP A05).
+    Checks: Injection risks, XSS, unsafe deserialization.
+    """
+    return scan_files(project_path, ["patterns"])["patterns"]
+
+
+def scan_configuration(project_path: str) -> Dict[str, Any]:
+    """
+    Validate security configuration (OWASP A02).
+    Checks: Security headers, CORS, debug modes.
+    """
+    return scan_files(project_path, ["config"])["config"]
+
+
+# ============================================================================
+#  FILE SCANNING (single traversal shared by secrets, patterns and config)
+# ============================================================================
+
+def walk_project(project_path: str) -> Iterator[Path]:
+    """Yield every file under project_path, skipping SKIP_DIRS and CACHE_DIR, in os.walk order."""
     for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS
+                   and not (d == CACHE_DIR.name and Path(root, d).resolve() == CACHE_DIR)]
         for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
-    
+            yield Path(root) / file
+
+
+def file_scanners(filepath: Path, scan_types) -> List[str]:
+    """Which of the enabled file scanners want this file, judged by its name."""
+    ext = filepath.suffix.lower()
+    wanted = []
+    if "secrets" in scan_types and (ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS):
+        wanted.append("secrets")
+    if "patterns" in scan_types and ext in CODE_EXTENSIONS:
+        wanted.append("patterns")
+    if "config" in scan_types and (ext in CONFIG_EXTENSIONS or filepath.name in CONFIG_FILENAMES):
+        wanted.append("config")
+    return wanted
+
+
+def scan_file(filepath: Path, rel_path: str, scanners: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read one file once and run each requested scanner over its content.
+    Returns {scanner: findings}, or None if the file can't be read.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except Exception:
+        return None
+    return scan_content(rel_path, content, scanners)
+
+
+def _decode(raw: bytes) -> str:
+    """Decode file bytes the way scan_file's text-mode read does."""
+    return raw.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def scan_content(rel_path: str, content: str, scanners: List[str], by_line: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run each requested scanner over one file's text; findings are reported against rel_path.
+    With by_line (diff-scoped scans) secrets are reported per line instead of counted per file.
+    """
+    # One case-folded copy and one set of anchors present serve every scanner
+    folded = _fold(content)
+    present = {anchor for anchor in _ANCHORS if anchor in folded}
+    findings = {}
+    if "secrets" in scanners and by_line:
+        findings["secrets"] = _secret_line_findings(rel_path, content, present)
+    elif "secrets" in scanners:
+        findings["secrets"] = _secret_findings(rel_path, content, folded if content.isascii() else None, present)
+    if "patterns" in scanners:
+        findings["patterns"] = _pattern_findings(rel_path, content, folded, present)
+    if "config" in scanners:
+        findings["config"] = _config_findings(rel_path, content, present)
+    return findings
+
+
+def _compile_rules(patterns: list) -> list:
+    """
+    [(compiled regex, anchors or None, prefix or None, *labels)] for SECRET_PATTERNS-style
+    tuples; prefix is the anchor every match starts with, when the pattern begins with it.
+    """
+    rules = []
+    for pattern, *labels in patterns:
+        anchors = PATTERN_ANCHORS.get(pattern)
+        prefix = None
+        if anchors and len(anchors) == 1 and pattern.lower().startswith(anchors[0]) \
+                and pattern[len(anchors[0]):len(anchors[0]) + 1] not in ("?", "*", "+", "{"):
+            prefix = anchors[0]
+        rules.append((re.compile(pattern, re.IGNORECASE), anchors, prefix, *labels))
+    return rules
+
+
+_SECRET_RULES = _compile_rules(SECRET_PATTERNS)
+_DANGEROUS_RULES = _compile_rules(DANGEROUS_PATTERNS)
+_CONFIG_RULES = _compile_rules(CONFIG_PATTERNS)
+_ANCHORS = sorted({anchor for anchors in PATTERN_ANCHORS.values() for anchor in anchors})
+
+
+def _fold(text: str) -> str:
+    """Lowercase text so that a literal anchor is found wherever re.IGNORECASE would match it."""
+    if text.isascii():
+        return text.lower()
+    # The non-ASCII characters IGNORECASE treats as ASCII letters (K, the Kelvin sign, lowers to k)
+    return text.replace("\u0130", "i").lower().replace("\u0131", "i").replace("\u017f", "s")
+
+
+def _may_match(anchors, present) -> bool:
+    """Whether a rule can match text containing the anchors in present."""
+    return anchors is None or any(anchor in present for anchor in anchors)
+
+
+def _count_matches(regex, content: str, folded: str, prefix: str) -> int:
+    """
+    len(regex.findall(content)). When every match starts with prefix and folded lines up
+    with content (ASCII text), matches are only attempted where prefix occurs.
+    """
+    if prefix is None or folded is None:
+        return len(regex.findall(content))
+    count = 0
+    pos = folded.find(prefix)
+    while pos != -1:
+        match = regex.match(content, pos)
+        if match:
+            count += 1
+            pos = folded.find(prefix, max(match.end(), pos + 1))
+        else:
+            pos = folded.find(prefix, pos + 1)
+    return count
+
+
+def _anchor_lines(folded: str, folded_lines: List[str], anchors) -> List[int]:
+    """Indexes of the lines containing any of the anchors, found by searching the whole text."""
+    ends = list(accumulate(len(line) + 1 for line in folded_lines))
+    found = set()
+    for anchor in anchors:
+        pos = folded.find(anchor)
+        while pos != -1:
+            index = bisect_right(ends, pos)
+            found.add(index)
+            pos = folded.find(anchor, ends[index]) if index + 1 < len(ends) else -1
+    return sorted(found)
+
+
+def _secret_findings(rel_path: str, content: str, folded: str, present: set) -> List[Dict[str, Any]]:
+    """One finding per SECRET_PATTERNS entry that matches, with its match count."""
+    findings = []
+    for regex, anchors, prefix, secret_type, severity in _SECRET_RULES:
+        if not _may_match(anchors, present):
+            continue
+        count = _count_matches(regex, content, folded, prefix)
+        if count:
+            findings.append({
+                "file": rel_path,
+                "type": secret_type,
+                "severity": severity,
+                "count": count
+            })
+    return findings
+
+
+def _secret_line_findings(rel_path: str, content: str, present: set) -> List[Dict[str, Any]]:
+    """One finding per (line, SECRET_PATTERNS entry) match, at the line the match starts on."""
+    line_starts = None
+    found = {}
+    for order, (regex, anchors, _, secret_type, severity) in enumerate(_SECRET_RULES):
+        if not _may_match(anchors, present):
+            continue
+        for match in regex.finditer(content):
+            if line_starts is None:
+                line_starts = [0] + [newline.end() for newline in re.finditer("\n", content)]
+            line = bisect_right(line_starts, match.start())
+            found.setdefault((line, order), {
+                "file": rel_path,
+                "line": line,
+                "type": secret_type,
+                "severity": severity
+            })
+    return [found[key] for key in sorted(found)]
+
+
+def _pattern_findings(rel_path: str, content: str, folded: str, present: set) -> List[Dict[str, Any]]:
+    """One finding per (line, DANGEROUS_PATTERNS entry) match; only lines with an anchor are searched."""
+    rules = [rule for rule in _DANGEROUS_RULES if _may_match(rule[1], present)]
+    if not rules:
+        return []
+    lines = content.split("\n")
+    folded_lines = folded.split("\n")
+    if any(rule[1] is None for rule in rules):
+        candidates = range(len(lines))
+    else:
+        candidates = _anchor_lines(folded, folded_lines, {anchor for rule in rules for anchor in rule[1] if anchor in present})
+
+    findings = []
+    for index in candidates:
+        line, folded_line = lines[index], folded_lines[index]
+        for regex, anchors, _, name, severity, category in rules:
+            if (anchors is None or any(anchor in folded_line for anchor in anchors)) and regex.search(line):
+                findings.append({
+                    "file": rel_path,
+                    "line": index + 1,
+                    "pattern": name,
+                    "severity": severity,
+                    "category": category,
+                    "snippet": line.strip()[:80]
+                })
+    return findings
+
+
+def _config_findings(rel_path: str, content: str, present: set) -> List[Dict[str, Any]]:
+    """One finding per CONFIG_PATTERNS entry found in a config file."""
+    findings = []
+    for regex, anchors, _, issue, severity in _CONFIG_RULES:
+        if _may_match(anchors, present) and regex.search(content):
+            findings.append({
+                "file": rel_path,
+                "issue": issue,
+                "severity": severity
+            })
+    return findings
+
+
+def scan_files(project_path: str, scan_types, jobs: int = 1, use_cache: bool = False,
+               changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+               contents: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the file-based scanners ("secrets", "patterns", "config") in one traversal.
+    Each candidate file is read once and handed to every enabled scanner that wants it,
+    so I/O grows with the tree rather than with the number of scanners.
+    With jobs > 1 the files are scanned in chunks across a process pool; findings are
+    merged in sorted path order either way, so the report doesn't depend on jobs.
+    With use_cache, files unchanged since the last cached run reuse their findings.
+    With changes (see git_changes) only the changed files are scanned, and only on their
+    changed lines; the cache isn't used then. contents (see git_index_contents) supplies
+    the text to scan in place of the working-tree files.
+    """
+    results = {}
+    if "secrets" in scan_types:
+        results["secrets"] = {
+            "tool": "secret_scanner",
+            "findings": [],
+            "status": "[OK] No secrets detected",
+            "scanned_files": 0,
+            "by_severity": {"critical": 0, "high": 0, "medium": 0}
+        }
+    if "patterns" in scan_types:
+        results["patterns"] = {
+            "tool": "pattern_scanner",
+            "findings": [],
+            "status": "[OK] No dangerous patterns",
+            "scanned_files": 0,
+            "by_category": {}
+        }
+    if "config" in scan_types:
+        results["config"] = {
+            "tool": "config_scanner",
+            "findings": [],
+            "status": "[OK] Configuration secure",
+            "checks": {}
+        }
+
+    candidates = []
+    for filepath in walk_project(project_path) if changes is None else changed_paths(project_path, changes, contents):
+        scanners = file_scanners(filepath, results)
+        if not scanners:
+            continue
+        for name in scanners:
+            if "scanned_files" in results[name]:
+                results[name]["scanned_files"] += 1
+        candidates.append((filepath, str(filepath.relative_to(project_path)), scanners))
+    candidates.sort(key=lambda candidate: candidate[1])
+
+    if changes is not None:
+        work = []
+        for candidate in candidates:
+            path = Path(candidate[1]).as_posix()
+            work.append((*candidate, changes[path], contents[path] if contents is not None else None))
+        scanned = _scan_candidates(work, jobs, _scan_changed_candidate)
+    elif use_cache:
+        scanned = FindingsCache.load(project_path).scan(candidates, jobs)
+    else:
+        scanned = _scan_candidates(candidates, jobs, _scan_candidate)
+    for file_findings in scanned:
+        if file_findings:
+            _merge_file_findings(results, file_findings)
+
+    if "secrets" in results:
+        _finish_secrets(results["secrets"])
+    if "patterns" in results:
+        _finish_patterns(results["patterns"])
+    if "config" in results:
+        _finish_config(results["config"], project_path)
+    return results
+
+
+def _scan_candidate(candidate) -> Dict[str, List[Dict[str, Any]]]:
+    """scan_file over one (filepath, rel_path, scanners) tuple; the process pool's work item."""
+    return scan_file(*candidate)
+
+
+def _scan_candidates(candidates: list, jobs: int, worker) -> Iterator[Any]:
+    """Yield worker(candidate) for candidates in order, across jobs worker processes."""
+    if jobs <= 1 or len(candidates) < 2:
+        yield from map(worker, candidates)
+        return
+    # Several chunks per worker keeps the pool balanced when a few files dominate
+    chunksize = max(1, len(candidates) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, candidates, chunksize=chunksize)
+
+
+def _merge_file_findings(results: Dict[str, Dict[str, Any]], file_findings: Dict[str, List[Dict[str, Any]]]):
+    """Add one file's findings to the scanners' running results."""
+    for name, findings in file_findings.items():
+        results[name]["findings"].extend(findings)
+        if name == "secrets":
+            for finding in findings:
+                results[name]["by_severity"][finding["severity"]] += finding.get("count", 1)
+        elif name == "patterns":
+            by_category = results[name]["by_category"]
+            for finding in findings:
+                by_category[finding["category"]] = by_category.get(finding["category"], 0) + 1
+
+
+def _finish_secrets(results: Dict[str, Any]):
+    """Set the secret scanner's status and trim its findings."""
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
     elif results["by_severity"]["high"] > 0:
@@ -229,54 +593,10 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     
     # Limit findings for output
     results["findings"] = results["findings"][:15]
-    
-    return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
-    """
-    Validate dangerous code patterns (OWASP A05).
-    Checks: Injection risks, XSS, unsafe deserialization.
-    """
-    results = {
-        "tool": "pattern_scanner",
-        "findings": [],
-        "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
-        "by_category": {}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
-    
+def _finish_patterns(results: Dict[str, Any]):
+    """Set the pattern scanner's status and trim its findings."""
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
     
@@ -289,57 +609,10 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     
     # Limit findings
     results["findings"] = results["findings"][:20]
-    
-    return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
-    """
-    Validate security configuration (OWASP A02).
-    Checks: Security headers, CORS, debug modes.
-    """
-    results = {
-        "tool": "config_scanner",
-        "findings": [],
-        "status": "[OK] Configuration secure",
-        "checks": {}
-    }
-    
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
+def _finish_config(results: Dict[str, Any], project_path: str):
+    """Check for security header configuration and set the config scanner's status."""
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
     for hf in header_files:
@@ -361,16 +634,258 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         results["status"] = "[!] HIGH: Configuration review needed"
     elif results["findings"]:
         results["status"] = "[?] Minor configuration issues"
-    
-    return results
+
+
+# ============================================================================
+#  FINDINGS CACHE (per-file findings reused across runs)
+# ============================================================================
+
+# Findings depend on a file's content and on everything in this script that turns content into
+# findings: the pattern tables, PATTERN_ANCHORS, the extension and skip sets and the matching
+# code. Hashing the script's own source covers all of them without a list to keep in sync.
+RULES_VERSION = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+class FindingsCache:
+    """
+    Findings from earlier runs per project file, stored under CACHE_DIR. An entry is reused
+    while the file keeps its size and mtime, or, once touched, its SHA-1; the whole cache is
+    dropped when RULES_VERSION changes.
+    """
+
+    def __init__(self, path: Path, root: Path, files: Dict[str, Dict[str, Any]]):
+        self.path = path
+        self.root = root
+        self.files = files
+
+    @staticmethod
+    def cache_path(project_path: str) -> Path:
+        """One cache file per scanned project, named after its resolved path."""
+        key = hashlib.sha1(str(Path(project_path).resolve()).encode("utf-8")).hexdigest()[:16]
+        return CACHE_DIR / f"security_scan-{key}.json"
+
+    @classmethod
+    def load(cls, project_path: str) -> "FindingsCache":
+        """The project's cache, or an empty one if it is missing, unreadable or outdated."""
+        path = cls.cache_path(project_path)
+        root = Path(project_path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if data and data.get("version") == CACHE_VERSION and data.get("rules") == RULES_VERSION:
+            return cls(path, root, data["files"])
+        return cls(path, root, {})
+
+    def lookup(self, filepath: Path, rel_path: str, scanners: List[str]):
+        """Cached findings for scanners if the file's size and mtime are unchanged, else None."""
+        entry = self.files.get(rel_path)
+        if not entry or any(name not in entry["findings"] for name in scanners):
+            return None
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            return None
+        return {name: entry["findings"][name] for name in scanners}
+
+    def scan(self, candidates: list, jobs: int) -> list:
+        """
+        scan_file results for (filepath, rel_path, scanners) candidates, in order. Only cache
+        misses are read, across jobs processes; the cache is then written back.
+        """
+        results = [self.lookup(*candidate) for candidate in candidates]
+        misses = [i for i, found in enumerate(results) if found is None]
+        work = [(*candidates[i], self.files.get(candidates[i][1])) for i in misses]
+        changed = False
+        for i, (findings, entry) in zip(misses, _scan_candidates(work, jobs, _rescan_candidate)):
+            results[i] = findings
+            if entry is not None:
+                self.files[candidates[i][1]] = entry
+                changed = True
+
+        # Forget deleted files; ones this scan type didn't look at are kept
+        seen = {candidate[1] for candidate in candidates}
+        for rel_path in [rel for rel in self.files if rel not in seen and not (self.root / rel).is_file()]:
+            del self.files[rel_path]
+            changed = True
+        if changed:
+            self.save()
+        return results
+
+    def save(self):
+        """Write the cache atomically; an unwritable CACHE_DIR just means no cache."""
+        state = {"version": CACHE_VERSION, "rules": RULES_VERSION, "files": self.files}
+        # Unique per process and thread, like the ui-ux-pro-max writers, so concurrent scans never share it
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+
+def _rescan_candidate(candidate):
+    """
+    Cache-miss work item for (filepath, rel_path, scanners, old entry or None): returns
+    (findings, new cache entry), reusing the old findings when only the mtime moved.
+    """
+    filepath, rel_path, scanners, old = candidate
+    try:
+        stat = os.stat(filepath)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None, None
+    sha1 = hashlib.sha1(raw).hexdigest()
+    findings = dict(old["findings"]) if old and old["sha1"] == sha1 else {}
+    missing = [name for name in scanners if name not in findings]
+    if missing:
+        findings.update(scan_content(rel_path, _decode(raw), missing))
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": sha1, "findings": findings}
+    return {name: findings[name] for name in scanners}, entry
+
+
+# ============================================================================
+#  GIT-SCOPED SCANNING (--since / --staged)
+# ============================================================================
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def _git(project_path: str, *args: str) -> str:
+    """stdout of a git command run in project_path; RuntimeError with git's message if it fails."""
+    try:
+        result = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=project_path,
+                                capture_output=True, text=True, encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        raise RuntimeError("git not found")
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def git_changes(project_path: str, since: Optional[str] = None, staged: bool = False) -> Dict[str, Optional[Set[int]]]:
+    """
+    {path relative to project_path: added or modified line numbers} for files changed since
+    the git ref (working tree against since, plus untracked files) or staged for commit.
+    Untracked files map to None, meaning every line is new. Deleted files are left out.
+    """
+    _git(project_path, "rev-parse", "--git-dir")  # outside a repo git diff would fall back to --no-index
+    if not staged:
+        # Resolve the ref up front so a value like "--output=x" can't reach git diff as an option
+        try:
+            since = _git(project_path, "rev-parse", "--verify", "--quiet", "--end-of-options", f"{since}^{{commit}}").strip()
+        except RuntimeError:
+            raise RuntimeError(f"not a commit: {since}")
+    diff = _git(project_path, "diff", "--no-color", "--no-ext-diff", "-U0", "--relative", "--diff-filter=ACMR",
+                *(["--cached"] if staged else [since]), "--")
+    changes = {}
+    lines = None
+    in_header = False  # hunk bodies can contain lines like "+++ x" (an added "++ x")
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            in_header = True
+        elif in_header and line.startswith("+++ "):
+            path = line[4:].rstrip("\t")  # git appends a tab to paths containing spaces
+            lines = changes.setdefault(path[2:] if path.startswith("b/") else path, set())
+        elif line.startswith("@@"):
+            in_header = False
+            hunk = _HUNK_HEADER.match(line)
+            if hunk and lines is not None:
+                start, count = int(hunk.group(1)), int(hunk.group(2) or 1)
+                lines.update(range(start, start + count))
+    if not staged:
+        for path in _git(project_path, "ls-files", "--others", "--exclude-standard").splitlines():
+            changes[path] = None
+    return changes
+
+
+def git_index_contents(project_path: str, paths) -> Dict[str, str]:
+    """
+    {path: text} of the staged version of each path (relative to project_path), read with
+    one `git cat-file --batch` call. Paths with no blob in the index are left out.
+    """
+    paths = list(paths)
+    request = "".join(f":./{path}\n" for path in paths).encode("utf-8")
+    try:
+        result = subprocess.run(["git", "cat-file", "--batch"], cwd=project_path, input=request, capture_output=True)
+    except FileNotFoundError:
+        raise RuntimeError("git not found")
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", errors="replace").strip() or "git cat-file failed")
+
+    # Each answer is "<oid> <type> <size>\n<content>\n", or "<name> missing\n"
+    out = result.stdout
+    contents = {}
+    pos = 0
+    for path in paths:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if len(header) == 3 and header[2].isdigit():
+            size = int(header[2])
+            if header[1] == b"blob":
+                contents[path] = _decode(out[pos:pos + size])
+            pos += size + 1
+    return contents
+
+
+def changed_paths(project_path: str, changes: Dict[str, Optional[Set[int]]],
+                  contents: Optional[Dict[str, str]] = None) -> Iterator[Path]:
+    """
+    Yield the changed files that still exist (in contents when given, else in the working
+    tree), skipping SKIP_DIRS and CACHE_DIR like walk_project.
+    """
+    for rel_path in changes:
+        filepath = Path(project_path) / rel_path
+        parents = filepath.relative_to(project_path).parts[:-1]
+        if any(part in SKIP_DIRS for part in parents):
+            continue
+        if CACHE_DIR.name in parents and CACHE_DIR in filepath.resolve().parents:
+            continue
+        if rel_path in contents if contents is not None else filepath.is_file():
+            yield filepath
+
+
+def _scan_changed_candidate(candidate) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Work item for (filepath, rel_path, scanners, changed lines or None, text or None): scan
+    the text (the file's when None) restricted to the changed lines. The other lines are
+    blanked, so reported line numbers still hold.
+    """
+    filepath, rel_path, scanners, lines, content = candidate
+    if content is None:
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception:
+            return None
+    if lines is not None:
+        content = "\n".join(line if number in lines else "" for number, line in enumerate(content.split("\n"), 1))
+    return scan_content(rel_path, content, scanners, by_line=True)
 
 
 # ============================================================================
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", jobs: int = 1, use_cache: bool = False,
+                  changes: Optional[Dict[str, Optional[Set[int]]]] = None,
+                  contents: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Execute security validation scans; jobs > 1 scans files in that many processes and
+    use_cache reuses the findings of files unchanged since the last cached run. With
+    changes (see git_changes) only the changed lines of changed files are scanned, taken
+    from contents instead of the working tree when given (see git_index_contents).
+    """
     
     report = {
         "project": project_path,
@@ -384,6 +899,8 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
             "overall_status": "[OK] SECURE"
         }
     }
+    if changes is not None:
+        report["changed_files"] = len(changes)
     
     scanners = {
         "deps": ("dependencies", scan_dependencies),
@@ -392,9 +909,16 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         "config": ("configuration", scan_configuration),
     }
     
+    # secrets, patterns and config share one traversal that reads each file once
+    file_scans = [key for key in FILE_SCAN_TYPES if scan_type in ("all", key)]
+    file_results = scan_files(project_path, file_scans, jobs, use_cache, changes, contents) if file_scans else {}
+    # The dependency scan looks at the whole project, so a diff only triggers it via its manifests
+    if changes is not None and not DEPENDENCY_FILES.intersection(changes):
+        file_results["deps"] = {"tool": "dependency_scanner", "findings": [], "status": "[OK] No dependency files changed"}
+    
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = file_results[key] if key in file_results else scanner(project_path)
             report["scans"][name] = result
             
             findings_count = len(result.get("findings", []))
@@ -427,14 +951,34 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for file scanning (0 = one per CPU, default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rescan every file instead of reusing findings cached in .agent/.cache/")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--since", metavar="GIT_REF",
+                       help="Only scan lines changed since this git ref (working tree, plus untracked files)")
+    scope.add_argument("--staged", action="store_true",
+                       help="Only scan lines staged for commit, as they are in the index")
     
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    changes = contents = None
+    if args.since or args.staged:
+        try:
+            changes = git_changes(args.project_path, args.since, args.staged)
+            if args.staged:
+                contents = git_index_contents(args.project_path, changes)
+        except RuntimeError as e:
+            print(json.dumps({"error": f"git: {e}"}))
+            sys.exit(1)
+    
+    result = run_full_scan(args.project_path, args.scan_type, jobs, not args.no_cache, changes, contents)
     
     if args.output == "summary":
         print(f"\n{'='*60}")